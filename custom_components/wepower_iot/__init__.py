@@ -1,12 +1,10 @@
 """The Gemns™ IoT integration."""
 
-import json
 import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers import service
 
 from .const import DOMAIN
 from .device_management import GemnsDeviceManager
@@ -50,6 +48,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # Start the coordinator
         entry.async_on_unload(coordinator.async_start())
         
+        # Pick up decryption key changes without re-decoding it per packet
+        entry.async_on_unload(entry.add_update_listener(coordinator.async_entry_updated))
+        
         return True
     else:
         # This is a traditional MQTT-based entry
@@ -111,8 +112,7 @@ async def _register_services(hass: HomeAssistant, device_manager: GemnsDeviceMan
     async def remove_device(service_call):
         """Remove a device."""
         device_id = service_call.data.get("device_id")
-        if device_id and device_id in device_manager.devices:
-            del device_manager.devices[device_id]
+        if device_id and device_manager.remove_device(device_id):
             hass.bus.async_fire(f"{DOMAIN}_device_removed", {"device_id": device_id})
     
     async def create_entities_for_devices(service_call):
@@ -1,8 +1,7 @@
 """BLE binary sensor platform for Gemns™ IoT integration."""
 
 import logging
-from typing import Any, Dict, Optional
-from datetime import datetime, timezone
+from typing import Any, Dict
 
 from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
@@ -11,13 +10,55 @@ from homeassistant.components.binary_sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity import DeviceInfo
 
-from .const import DOMAIN, CONF_ADDRESS, CONF_NAME
-from .ble_coordinator import GemnsBluetoothProcessorCoordinator
+from .const import DOMAIN, CONF_ADDRESS, CONF_NAME, STATE_WRITE_COOLDOWN
+from .ble_coordinator import (
+    GemnsBluetoothProcessorCoordinator,
+    format_timestamp,
+    professional_device_id,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Device type -> model shown in the device registry (matching device_type_t enum)
+DEVICE_MODEL_MAP = {
+    "legacy": "Batteryless Legacy Device",           # DEVICE_TYPE_LEGACY = 0
+    "button": "Batteryless Button",                  # DEVICE_TYPE_BUTTON = 1  
+    "vibration_sensor": "Batteryless Vibration Monitor", # DEVICE_TYPE_VIBRATION_MONITOR = 2
+    "two_way_switch": "Batteryless Two-Way Switch",  # DEVICE_TYPE_TWO_WAY_SWITCH = 3
+    "leak_sensor": "Batteryless Leak Sensor",        # DEVICE_TYPE_LEAK_SENSOR = 4
+    "unknown_device": "Batteryless IoT Device",
+}
+
+# Device type -> suggested area
+DEVICE_AREA_MAP = {
+    "leak_sensor": "Kitchen",
+    "vibration_sensor": "Garage", 
+    "button": "Living Room",
+    "two_way_switch": "Bedroom",
+    "legacy": "Office",
+}
+
+# Device type -> sensor_data flag the packet parser sets for it
+DEVICE_VALUE_KEY_MAP = {
+    "leak_sensor": "leak_detected",
+    "vibration_sensor": "vibration_detected",
+    "two_way_switch": "switch_on",
+    "button": "button_pressed",
+    "legacy": "button_pressed",
+}
+
+# Device type -> MDI icon
+DEVICE_ICON_MAP = {
+    "leak_sensor": "mdi:water",
+    "vibration_sensor": "mdi:vibrate", 
+    "two_way_switch": "mdi:toggle-switch",
+    "button": "mdi:gesture-tap-button",
+    "legacy": "mdi:chip",
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -89,6 +130,14 @@ class GemnsBLEBinarySensor(BinarySensorEntity):
         
         # Device type will be determined from coordinator data
         self._device_type = "unknown"
+        self._properties_key = None
+        # sensor_data flag holding this device type's state, if known
+        self._value_key = None
+        self._device_info_key = None
+        self._last_signature = None
+        # Attributes are rebuilt only when the state signature changes instead
+        # of on every read of extra_state_attributes
+        self._attr_extra_state_attributes = self._build_extra_state_attributes()
         
     @property
     def address(self) -> str:
@@ -100,9 +149,8 @@ class GemnsBLEBinarySensor(BinarySensorEntity):
         """Return if entity is available."""
         return self.coordinator.available and self._attr_available
 
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return entity specific state attributes."""
+    def _build_extra_state_attributes(self) -> Dict[str, Any]:
+        """Build entity specific state attributes from the coordinator data."""
         attrs = {
             "address": self.address,
             "device_type": self._device_type,
@@ -112,17 +160,19 @@ class GemnsBLEBinarySensor(BinarySensorEntity):
         }
         
         # Add data from coordinator if available
-        if self.coordinator.data:
+        data = self.coordinator.data
+        if data:
+            available = self.coordinator.available
             attrs.update({
-                "rssi": self.coordinator.data.get("rssi"),
-                "last_seen": self.coordinator.data.get("timestamp"),
-                "ble_status": "active" if self.coordinator.available else "inactive",
-                "last_update_success": getattr(self.coordinator, 'last_update_success', True),
+                "rssi": data.get("rssi"),
+                "last_seen": format_timestamp(data.get("timestamp")),
+                "ble_status": "active" if available else "inactive",
+                "last_update_success": self.coordinator.last_update_success,
             })
             
             # Add sensor-specific attributes
-            if "sensor_data" in self.coordinator.data:
-                sensor_data = self.coordinator.data["sensor_data"]
+            sensor_data = data.get("sensor_data")
+            if sensor_data:
                 if "leak_detected" in sensor_data:
                     attrs["leak_detected"] = sensor_data["leak_detected"]
                 if "event_counter" in sensor_data:
@@ -134,7 +184,23 @@ class GemnsBLEBinarySensor(BinarySensorEntity):
 
     async def async_added_to_hass(self) -> None:
         """Call when entity is added to hass."""
+        # Prime state from data the coordinator already has, so the initial
+        # state write carries it and an identical first callback is skipped
+        if self.coordinator.data:
+            self._update_from_coordinator()
+            self._last_signature = self._state_signature()
+            self._attr_extra_state_attributes = self._build_extra_state_attributes()
         await super().async_added_to_hass()
+        # Attribute-only changes (RSSI, last seen, counters) are coalesced into
+        # one trailing state write per cooldown
+        self._attributes_debouncer = Debouncer(
+            self.hass,
+            _LOGGER,
+            cooldown=STATE_WRITE_COOLDOWN,
+            immediate=True,
+            function=self.async_write_ha_state,
+        )
+        self.async_on_remove(self._attributes_debouncer.async_cancel)
         # Register with coordinator to receive updates
         self._unsub_coordinator = self.coordinator.async_add_listener(self._handle_coordinator_update)
         # Set up cleanup when entity is removed
@@ -153,31 +219,59 @@ class GemnsBLEBinarySensor(BinarySensorEntity):
                 _LOGGER.info("🔄 BINARY SENSOR STATE CHANGED: %s | Previous: %s | New: %s", 
                            self.address, previous_state, self._attr_is_on)
             
-            self.async_write_ha_state()
+            # Skip the state write when nothing shown in the state or its
+            # attributes changed since the last one
+            signature = self._state_signature()
+            last_signature = self._last_signature
+            if signature == last_signature:
+                return
+            self._last_signature = signature
+            self._attr_extra_state_attributes = self._build_extra_state_attributes()
+            
+            # State, availability and device type changes are written at once so
+            # no transition is lost; the write also carries pending attributes
+            if last_signature is None or signature[:4] != last_signature[:4]:
+                self._attributes_debouncer.async_cancel()
+                self.async_write_ha_state()
+            else:
+                self._attributes_debouncer.async_schedule_call()
         except Exception as e:
             _LOGGER.error("Error handling coordinator update for %s: %s", self.address, e)
 
+    def _state_signature(self) -> tuple:
+        """Return the values the entity state and attributes are built from."""
+        data = self.coordinator.data or {}
+        return (
+            self._attr_is_on,
+            self._attr_available,
+            self._device_type,
+            self.coordinator.last_update_success,
+            data.get("rssi"),
+            data.get("battery_level"),
+            data.get("timestamp"),
+            data.get("sensor_data"),
+        )
+
     def _update_from_coordinator(self) -> None:
         """Update binary sensor state from coordinator data."""
-        if not self.coordinator.data:
+        log_enabled = _LOGGER.isEnabledFor(logging.INFO)
+        data = self.coordinator.data
+        if not data:
             # Simple restart detection: if device exists but no data, default to off
             self._attr_available = True
             self._attr_is_on = False  # Default to off when device restarts
             _LOGGER.debug("BLE binary sensor %s: No coordinator data - defaulting to off (restart scenario)", self.address)
             return
             
-        data = self.coordinator.data
-        _LOGGER.info("🔄 UPDATING BINARY SENSOR: %s | Coordinator data: %s", self.address, data)
+        if log_enabled:
+            _LOGGER.info("🔄 UPDATING BINARY SENSOR: %s | Coordinator data: %s", self.address, data)
         
-        # Update device type and name from coordinator data
+        # Update device type from coordinator data; the entity name follows
+        # from the device type in _set_sensor_properties
         self._device_type = data.get("device_type", "unknown")
-        coordinator_name = data.get("name", "Gemns™ IoT Device")
-        
-        # Update the entity name if coordinator has a better name
-        if coordinator_name != "Gemns™ IoT Device":
-            self._attr_name = coordinator_name
         
-        _LOGGER.info("🏷️ DEVICE TYPE: %s | Type: %s | Name: %s", self.address, self._device_type, self._attr_name)
+        if log_enabled:
+            _LOGGER.info("🏷️ DEVICE TYPE: %s | Type: %s | Name: %s", self.address, self._device_type, self._attr_name)
         
         # Set sensor properties based on device type
         self._set_sensor_properties()
@@ -190,12 +284,21 @@ class GemnsBLEBinarySensor(BinarySensorEntity):
         
         # Update availability
         self._attr_available = True
-        _LOGGER.info("✅ BINARY SENSOR UPDATED: %s | Available: %s | Value: %s | BLE_active: %s | Coordinator_available: %s", 
-                     self.address, self._attr_available, self._attr_is_on, True, self.coordinator.available)
+        if log_enabled:
+            _LOGGER.info("✅ BINARY SENSOR UPDATED: %s | Available: %s | Value: %s | BLE_active: %s | Coordinator_available: %s", 
+                         self.address, self._attr_available, self._attr_is_on, True, self.coordinator.available)
         
     def _set_sensor_properties(self) -> None:
         """Set binary sensor properties based on device type (matching device_type_t enum)."""
         device_type = self._device_type.lower()
+
+        # Name, icon and classes depend only on the device type and address,
+        # so the formatted name is only rebuilt when one of them changes
+        properties_key = (device_type, self.address)
+        if properties_key == self._properties_key:
+            return
+        self._properties_key = properties_key
+        self._value_key = DEVICE_VALUE_KEY_MAP.get(device_type)
         
         # Set properties based on device type (matching device_type_t enum)
         if device_type == "leak_sensor":
@@ -236,27 +339,15 @@ class GemnsBLEBinarySensor(BinarySensorEntity):
         """Update device info with proper name and model."""
         device_type = self._device_type.lower()
         
-        # Set model based on device type (matching device_type_t enum)
-        model_map = {
-            "legacy": "Batteryless Legacy Device",           # DEVICE_TYPE_LEGACY = 0
-            "button": "Batteryless Button",                  # DEVICE_TYPE_BUTTON = 1  
-            "vibration_sensor": "Batteryless Vibration Monitor", # DEVICE_TYPE_VIBRATION_MONITOR = 2
-            "two_way_switch": "Batteryless Two-Way Switch",  # DEVICE_TYPE_TWO_WAY_SWITCH = 3
-            "leak_sensor": "Batteryless Leak Sensor",        # DEVICE_TYPE_LEAK_SENSOR = 4
-            "unknown_device": "Batteryless IoT Device"
-        }
+        # Keep the existing DeviceInfo unless something it is built from changed
+        device_info_key = (device_type, self.address, self._attr_name)
+        if device_info_key == self._device_info_key:
+            return
+        self._device_info_key = device_info_key
         
-        model = model_map.get(device_type, "IoT Sensor")
+        model = DEVICE_MODEL_MAP.get(device_type, "IoT Sensor")
         
-        # Set suggested area based on device type
-        area_map = {
-            "leak_sensor": "Kitchen",
-            "vibration_sensor": "Garage", 
-            "button": "Living Room",
-            "two_way_switch": "Bedroom",
-            "legacy": "Office"
-        }
-        suggested_area = area_map.get(device_type, "Home")
+        suggested_area = DEVICE_AREA_MAP.get(device_type, "Home")
         
         # Set device image based on device type
         device_image = self._get_device_image(device_type)
@@ -288,76 +379,75 @@ class GemnsBLEBinarySensor(BinarySensorEntity):
             device_number = int(hash_hex[:3], 16) % 1000
             return f"Test-{device_number:03d}"
         
-        # Remove colons and get last 6 characters
-        clean_address = self.address.replace(":", "").upper()
-        last_6 = clean_address[-6:]
-        
-        # Convert to a more professional format
-        device_number = int(last_6, 16) % 1000  # Get a number between 0-999
-        return f"Unit-{device_number:03d}"
+        # Formatted once per address and shared with the coordinator
+        return professional_device_id(self.address)
     
     def _get_device_image(self, device_type: str) -> str:
         """Get device image URL based on device type."""
-        # Map device types to their corresponding MDI icons
-        icon_map = {
-            "leak_sensor": "mdi:water",
-            "vibration_sensor": "mdi:vibrate", 
-            "two_way_switch": "mdi:toggle-switch",
-            "button": "mdi:gesture-tap-button",
-            "legacy": "mdi:chip",
-        }
-        
-        return icon_map.get(device_type.lower(), "mdi:chip")
+        return DEVICE_ICON_MAP.get(device_type.lower(), "mdi:chip")
             
     def _extract_binary_sensor_value(self, data: Dict[str, Any]) -> None:
         """Extract binary sensor value from coordinator data."""
-        _LOGGER.info("🔍 EXTRACTING BINARY SENSOR VALUE: %s | Data: %s", self.address, data)
+        log_enabled = _LOGGER.isEnabledFor(logging.INFO)
+        if log_enabled:
+            _LOGGER.info("🔍 EXTRACTING BINARY SENSOR VALUE: %s | Data: %s", self.address, data)
         
         # Try to get sensor value from sensor_data
         sensor_data = data.get("sensor_data", {})
-        _LOGGER.info("📊 SENSOR DATA: %s | Sensor data: %s", self.address, sensor_data)
+        if log_enabled:
+            _LOGGER.info("📊 SENSOR DATA: %s | Sensor data: %s", self.address, sensor_data)
         
-        if "leak_detected" in sensor_data:
+        value_key = self._value_key
+        value = sensor_data.get(value_key) if value_key is not None else None
+        if value is not None:
+            # Flag bound to the device type in _set_sensor_properties
+            self._attr_is_on = value
+            if log_enabled:
+                _LOGGER.info("🔘 BINARY VALUE: %s | %s: %s", self.address, value_key, value)
+            
+        elif "leak_detected" in sensor_data:
             # DEVICE_TYPE_LEAK_SENSOR = 4 - EVENT_TYPE_LEAK_DETECTED = 4
             self._attr_is_on = sensor_data["leak_detected"]
-            _LOGGER.info("💧 LEAK BINARY SENSOR: %s | Leak detected: %s | Value: %s", 
-                        self.address, sensor_data["leak_detected"], self._attr_is_on)
+            if log_enabled:
+                _LOGGER.info("💧 LEAK BINARY SENSOR: %s | Leak detected: %s | Value: %s", 
+                            self.address, sensor_data["leak_detected"], self._attr_is_on)
             
         elif "vibration_detected" in sensor_data:
             # DEVICE_TYPE_VIBRATION_MONITOR = 2 - EVENT_TYPE_VIBRATION = 1
             self._attr_is_on = sensor_data["vibration_detected"]
-            _LOGGER.info("📳 VIBRATION BINARY SENSOR: %s | Vibration detected: %s | Value: %s", 
-                        self.address, sensor_data["vibration_detected"], self._attr_is_on)
+            if log_enabled:
+                _LOGGER.info("📳 VIBRATION BINARY SENSOR: %s | Vibration detected: %s | Value: %s", 
+                            self.address, sensor_data["vibration_detected"], self._attr_is_on)
             
         elif "switch_on" in sensor_data:
             # DEVICE_TYPE_TWO_WAY_SWITCH = 3 - EVENT_TYPE_BUTTON_ON = 3
             self._attr_is_on = sensor_data["switch_on"]
-            _LOGGER.info("🔌 SWITCH BINARY SENSOR: %s | Switch on: %s | Value: %s", 
-                        self.address, sensor_data["switch_on"], self._attr_is_on)
+            if log_enabled:
+                _LOGGER.info("🔌 SWITCH BINARY SENSOR: %s | Switch on: %s | Value: %s", 
+                            self.address, sensor_data["switch_on"], self._attr_is_on)
             
         elif "button_pressed" in sensor_data:
             # DEVICE_TYPE_BUTTON = 1, DEVICE_TYPE_LEGACY = 0 - EVENT_TYPE_BUTTON_PRESS = 0
             self._attr_is_on = sensor_data["button_pressed"]
-            _LOGGER.info("🔘 BUTTON BINARY SENSOR: %s | Button pressed: %s | Value: %s", 
-                        self.address, sensor_data["button_pressed"], self._attr_is_on)
+            if log_enabled:
+                _LOGGER.info("🔘 BUTTON BINARY SENSOR: %s | Button pressed: %s | Value: %s", 
+                            self.address, sensor_data["button_pressed"], self._attr_is_on)
             
         elif "sensor_event" in sensor_data:
             # For other sensors, use sensor_event as binary state
             self._attr_is_on = sensor_data["sensor_event"] > 0
-            _LOGGER.info("📡 SENSOR EVENT BINARY: %s | Event: %s | Value: %s", 
-                        self.address, sensor_data["sensor_event"], self._attr_is_on)
+            if log_enabled:
+                _LOGGER.info("📡 SENSOR EVENT BINARY: %s | Event: %s | Value: %s", 
+                            self.address, sensor_data["sensor_event"], self._attr_is_on)
             
         else:
             # No specific binary value found, check if this is a leak sensor
             if "leak" in self._device_type.lower():
                 # For leak sensors without data, assume no leak (False)
                 self._attr_is_on = False
-                _LOGGER.info("💧 LEAK SENSOR DEFAULT: %s | No leak data, assuming no leak (False)", self.address)
+                if log_enabled:
+                    _LOGGER.info("💧 LEAK SENSOR DEFAULT: %s | No leak data, assuming no leak (False)", self.address)
             else:
                 # For other sensors, default to False
                 self._attr_is_on = False
                 _LOGGER.warning("⚠️ NO BINARY VALUE: %s | No leak detection or sensor event found", self.address)
-
-    async def async_update(self) -> None:
-        """Update binary sensor state."""
-        await self.coordinator.async_request_refresh()
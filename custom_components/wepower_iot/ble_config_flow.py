@@ -2,51 +2,135 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 import logging
+import re
 from typing import Any
 
 from homeassistant.components.bluetooth import (
     BluetoothServiceInfo,
     async_discovered_service_info,
-    async_process_advertisements,
 )
-from homeassistant.config_entries import ConfigEntry, ConfigFlow, FlowResult
+from homeassistant.config_entries import ConfigFlow, FlowResult
 from homeassistant.const import CONF_ADDRESS, CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 import voluptuous as vol
 
-from .const import DOMAIN, BLE_COMPANY_ID, CONF_DECRYPTION_KEY, CONF_DEVICE_NAME, CONF_DEVICE_TYPE
+from .const import (
+    DOMAIN,
+    BLE_COMPANY_ID,
+    CONF_DECRYPTION_KEY,
+    CONF_DEVICE_NAME,
+    CONF_DEVICE_TYPE,
+    DEVICE_TYPE_CHOICES,
+    DECRYPTION_KEY_RE,
+    SENSOR_TYPE_LEAK,
+)
+from .ble_coordinator import DEVICE_TYPE_MAP, is_gems_device, professional_device_id
+from .packet_parser import GemnsPacket
 
 _LOGGER = logging.getLogger(__name__)
 
+# Device type -> sensor type stored in the config entry, derived from the
+# coordinator's table for the provisionable types (default leak sensor)
+DEVICE_TYPE_SENSOR_TYPE_MAP: dict[str, int] = {
+    "legacy": 0,
+    **{DEVICE_TYPE_MAP[sensor_type][0]: sensor_type for sensor_type in DEVICE_TYPE_CHOICES},
+    "unknown": SENSOR_TYPE_LEAK,  # Default to leak sensor
+}
+
+# Seconds a discovery scan is shared by re-renders and concurrent flows
+DISCOVERY_RESCAN_INTERVAL = 2.0
+
+# hass.data key holding (expires at, Gemns™ IoT service infos by address)
+DISCOVERY_SCAN_CACHE = f"{DOMAIN}_ble_discovery_scan"
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_NAME): str,
         vol.Required(CONF_ADDRESS): str,
         vol.Required(CONF_DECRYPTION_KEY): str,
         vol.Optional(CONF_DEVICE_NAME): str,
-        vol.Optional(CONF_DEVICE_TYPE, default=4): vol.In({
-            "1": "Button",
-            "2": "Vibration Monitor", 
-            "3": "Two Way Switch",
-            "4": "Leak Sensor"
-        }),
+        vol.Optional(CONF_DEVICE_TYPE, default=SENSOR_TYPE_LEAK): vol.All(
+            vol.Coerce(int), vol.In(DEVICE_TYPE_CHOICES)
+        ),
     }
 )
 
-STEP_DISCOVERY_DATA_SCHEMA = vol.Schema(
+STEP_USER_CONFIG_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_DECRYPTION_KEY): str,
-        vol.Optional(CONF_DEVICE_NAME): str,
-        vol.Optional(CONF_DEVICE_TYPE, default=4): vol.In({
-            "1": "Button",
-            "2": "Vibration Monitor", 
-            "3": "Two Way Switch",
-            "4": "Leak Sensor"
-        }),
     }
 )
 
+# Device-specific description shown on the user_config step
+USER_CONFIG_DESCRIPTIONS: dict[str, str] = {
+    "leak_sensor": "Configure your Gemns™ IoT Leak Sensor. This device detects water leaks and moisture.",
+    "vibration_sensor": "Configure your Gemns™ IoT Vibration Monitor. This device detects vibrations and movement.",
+    "two_way_switch": "Configure your Gemns™ IoT Two-Way Switch. This device can be turned on/off remotely.",
+    "button": "Configure your Gemns™ IoT Button. This device sends signals when pressed.",
+    "legacy": "Configure your Gemns™ IoT Legacy Device. This device provides basic IoT functionality.",
+    "unknown": "Configure your Gemns™ IoT Device. This device provides IoT functionality."
+}
+
+# Sensor type from beacon data -> (device type, device name prefix); the
+# coordinator's table plus the legacy type only seen at discovery, with the
+# constant part of each professional name formatted once
+BEACON_DEVICE_TYPE_MAP: dict[int, tuple[str, str]] = {
+    sensor_type: (device_type, f"Gemns™ IoT {device_label} ")
+    for sensor_type, (device_type, device_label) in {
+        0: ("legacy", "Legacy Device"),
+        **DEVICE_TYPE_MAP,
+    }.items()
+}
+BEACON_UNKNOWN_DEVICE_TYPE = ("unknown", "Gemns™ IoT IoT Device ")
+
+# Device type keywords in advertised names -> (device type, display name)
+NAME_DEVICE_TYPE_MAP: dict[str, tuple[str, str]] = {
+    "leak": ("leak_sensor", "Gemns™ IoT Leak Sensor"),
+    "vibration": ("vibration_sensor", "Gemns™ IoT Vibration Monitor"),
+    "switch": ("two_way_switch", "Gemns™ IoT Two-Way Switch"),
+    "button": ("button", "Gemns™ IoT Button"),
+}
+# One named group per keyword, so a match's lastgroup is the map key
+# without lower-casing the matched text
+NAME_DEVICE_TYPE_RE = re.compile(
+    "|".join(f"(?P<{keyword}>{keyword})" for keyword in NAME_DEVICE_TYPE_MAP),
+    re.IGNORECASE,
+)
+
+
+@callback
+def _async_gems_service_infos(hass: HomeAssistant) -> dict[str, BluetoothServiceInfo]:
+    """Return discovered Gemns™ IoT devices, sharing one scan between flows."""
+    now = hass.loop.time()
+    cached = hass.data.get(DISCOVERY_SCAN_CACHE)
+    if cached is not None and now < cached[0]:
+        return cached[1]
+    
+    # Addresses from the previous scan are Gemns™ IoT devices - only new ones
+    # need the manufacturer data and name checks
+    previous = cached[1] if cached is not None else {}
+    devices = {
+        discovery_info.address: discovery_info
+        for discovery_info in async_discovered_service_info(hass, connectable=False)
+        if discovery_info.address in previous or is_gems_device(discovery_info)
+    }
+    hass.data[DISCOVERY_SCAN_CACHE] = (now + DISCOVERY_RESCAN_INTERVAL, devices)
+    return devices
+
+
+@dataclass(slots=True)
+class _FlowState:
+    """Transient per-flow state for the BLE config flow."""
+
+    discovered_devices: dict[str, dict[str, Any]] = field(default_factory=dict)
+    # Device selection label per address, kept in step with
+    # discovered_devices; the schema is rebuilt only when it changes
+    device_options: dict[str, str] = field(default_factory=dict)
+    device_schema: vol.Schema | None = None
+    selected_device: dict[str, Any] | None = None
+
 
 class GemnsBluetoothConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Gemns™ IoT BLE."""
@@ -55,7 +139,7 @@ class GemnsBluetoothConfigFlow(ConfigFlow, domain=DOMAIN):
 
     def __init__(self) -> None:
         """Initialize the config flow."""
-        self._discovered_devices: dict[str, BluetoothServiceInfo] = {}
+        self._state = _FlowState()
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -66,22 +150,20 @@ class GemnsBluetoothConfigFlow(ConfigFlow, domain=DOMAIN):
             name = user_input[CONF_NAME]
             decryption_key = user_input[CONF_DECRYPTION_KEY]
             device_name = user_input.get(CONF_DEVICE_NAME, name)
-            device_type = int(user_input.get(CONF_DEVICE_TYPE, "4"))  # Convert string to int, default to leak sensor
+            device_type = user_input.get(CONF_DEVICE_TYPE, SENSOR_TYPE_LEAK)  # Coerced by the schema, default to leak sensor
             
-            # Validate decryption key format
-            try:
-                bytes.fromhex(decryption_key)
-                if len(decryption_key) != 32:  # 16 bytes = 32 hex chars
-                    return self.async_show_form(
-                        step_id="user",
-                        data_schema=STEP_USER_DATA_SCHEMA,
-                        errors={"base": "invalid_decryption_key_length"},
-                    )
-            except ValueError:
+            # Validate decryption key format (16 bytes = 32 hex chars)
+            if not DECRYPTION_KEY_RE.match(decryption_key):
                 return self.async_show_form(
                     step_id="user",
-                    data_schema=STEP_USER_DATA_SCHEMA,
-                    errors={"base": "invalid_decryption_key_format"},
+                    data_schema=self.add_suggested_values_to_schema(
+                        STEP_USER_DATA_SCHEMA, user_input
+                    ),
+                    errors={
+                        "base": "invalid_decryption_key_length"
+                        if len(decryption_key) != 32
+                        else "invalid_decryption_key_format"
+                    },
                 )
             
             # Check if already configured
@@ -113,24 +195,17 @@ class GemnsBluetoothConfigFlow(ConfigFlow, domain=DOMAIN):
         self, discovery_info: BluetoothServiceInfo
     ) -> FlowResult:
         """Handle the bluetooth discovery step - but we don't auto-configure."""
+        # Check if this looks like a Gemns™ IoT device first - a dict lookup,
+        # where the unique ID checks walk the in-progress flows and entries
+        if not is_gems_device(discovery_info):
+            return self.async_abort(reason="not_supported")
+        
         # We don't auto-configure devices anymore, just show them as available
         await self.async_set_unique_id(discovery_info.address)
         self._abort_if_unique_id_configured()
         
-        # Check if this looks like a Gemns™ IoT device
-        if not self._is_gems_device(discovery_info):
-            return self.async_abort(reason="not_supported")
-        
-        # Extract device type from beacon data for better discovery display
-        device_type, device_name = self._extract_device_info_from_beacon(discovery_info)
-        
-        # Store the device info with extracted type
-        self._discovered_devices[discovery_info.address] = {
-            "discovery_info": discovery_info,
-            "device_type": device_type,
-            "device_name": device_name
-        }
-        
+        # Discoveries are read back from HA's Bluetooth registry when the
+        # device selection form is rendered, so nothing is stored here
         return self.async_abort(reason="device_selection_required")
 
     async def async_step_device_selection(
@@ -138,36 +213,18 @@ class GemnsBluetoothConfigFlow(ConfigFlow, domain=DOMAIN):
     ) -> FlowResult:
         """Handle device selection step."""
         if user_input is None:
-            # Show discovered devices
-            devices = []
-            for address, device_info in self._discovered_devices.items():
-                device_type = device_info.get("device_type", "unknown")
-                device_name = device_info.get("device_name", "Gemns™ IoT Device")
-                
-                # Add device type icon
-                icon_map = {
-                    "leak_sensor": "mdi:water",
-                    "vibration_sensor": "mdi:vibrate", 
-                    "two_way_switch": "mdi:toggle-switch",
-                    "button": "mdi:gesture-tap-button",
-                    "legacy": "mdi:chip",
-                    "unknown": "mdi:chip"
-                }
-                
-                devices.append({
-                    "value": address,
-                    "label": f"{device_name} ({address})",
-                    "icon": icon_map.get(device_type, "mdi:chip")
+            self._refresh_discovered_devices()
+            
+            # Show discovered devices, reusing the schema built for the
+            # previous render until the set of discovered devices changes
+            if self._state.device_schema is None:
+                self._state.device_schema = vol.Schema({
+                    vol.Required("device"): vol.In(self._state.device_options)
                 })
             
             return self.async_show_form(
                 step_id="device_selection",
-                data_schema=vol.Schema({
-                    vol.Required("device"): vol.In({
-                        device["value"]: device["label"] 
-                        for device in devices
-                    })
-                }),
+                data_schema=self._state.device_schema,
                 description_placeholders={
                     "message": "Select the Gemns™ IoT device you want to configure:"
                 }
@@ -175,10 +232,10 @@ class GemnsBluetoothConfigFlow(ConfigFlow, domain=DOMAIN):
         
         # Device selected, proceed to configuration
         selected_address = user_input["device"]
-        device_info = self._discovered_devices[selected_address]
+        device_info = self._state.discovered_devices[selected_address]
         
         # Store selected device info for next step
-        self._selected_device = device_info
+        self._state.selected_device = device_info
         
         return await self.async_step_user_config()
 
@@ -186,31 +243,30 @@ class GemnsBluetoothConfigFlow(ConfigFlow, domain=DOMAIN):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle user configuration step with device-specific info."""
-        if user_input is None:
-            device_info = self._selected_device
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            decryption_key = user_input[CONF_DECRYPTION_KEY]
+            # Validate decryption key format (16 bytes = 32 hex chars)
+            if not DECRYPTION_KEY_RE.match(decryption_key):
+                errors["base"] = (
+                    "invalid_decryption_key_length"
+                    if len(decryption_key) != 32
+                    else "invalid_decryption_key_format"
+                )
+        
+        if user_input is None or errors:
+            device_info = self._state.selected_device
             device_type = device_info.get("device_type", "unknown")
             device_name = device_info.get("device_name", "Gemns™ IoT Device")
             
-            # Create device-specific schema
-            schema = {
-                vol.Required(CONF_DECRYPTION_KEY): str,
-            }
-            
-            # Add device-specific description
-            descriptions = {
-                "leak_sensor": "Configure your Gemns™ IoT Leak Sensor. This device detects water leaks and moisture.",
-                "vibration_sensor": "Configure your Gemns™ IoT Vibration Monitor. This device detects vibrations and movement.",
-                "two_way_switch": "Configure your Gemns™ IoT Two-Way Switch. This device can be turned on/off remotely.",
-                "button": "Configure your Gemns™ IoT Button. This device sends signals when pressed.",
-                "legacy": "Configure your Gemns™ IoT Legacy Device. This device provides basic IoT functionality.",
-                "unknown": "Configure your Gemns™ IoT Device. This device provides IoT functionality."
-            }
-            
             return self.async_show_form(
                 step_id="user_config",
-                data_schema=vol.Schema(schema),
+                data_schema=STEP_USER_CONFIG_DATA_SCHEMA,
+                errors=errors,
                 description_placeholders={
-                    "message": descriptions.get(device_type, descriptions["unknown"]),
+                    "message": USER_CONFIG_DESCRIPTIONS.get(
+                        device_type, USER_CONFIG_DESCRIPTIONS["unknown"]
+                    ),
                     "device_name": device_name,
                     "device_type": device_type.replace("_", " ").title(),
                     "integration_icon": "https://brands.home-assistant.io/_/gemns/icon.png"
@@ -218,97 +274,95 @@ class GemnsBluetoothConfigFlow(ConfigFlow, domain=DOMAIN):
             )
         
         # Configuration complete
-        device_info = self._selected_device
-        discovery_info = device_info["discovery_info"]
+        device_info = self._state.selected_device
         device_type = device_info.get("device_type", "unknown")
         device_name = device_info.get("device_name", "Gemns™ IoT Device")
         
-        # Map device type to sensor type
-        device_type_map = {
-            "legacy": 0,
-            "button": 1,
-            "vibration_sensor": 2,
-            "two_way_switch": 3,
-            "leak_sensor": 4,
-            "unknown": 4  # Default to leak sensor
-        }
+        device_type = DEVICE_TYPE_SENSOR_TYPE_MAP.get(device_type, SENSOR_TYPE_LEAK)
         
-        device_type = device_type_map.get(device_type, 4)
+        # Check if already configured (e.g. by another flow since the form
+        # was shown)
+        await self.async_set_unique_id(device_info["address"])
+        self._abort_if_unique_id_configured()
         
         # Create the config entry
         return self.async_create_entry(
             title=device_name,
             data={
                 CONF_NAME: device_name,
-                CONF_ADDRESS: discovery_info.address,
+                CONF_ADDRESS: device_info["address"],
                 CONF_DECRYPTION_KEY: user_input[CONF_DECRYPTION_KEY],
                 CONF_DEVICE_NAME: device_name,
                 CONF_DEVICE_TYPE: device_type,
             },
         )
 
-    def _is_gems_device(self, discovery_info: BluetoothServiceInfo) -> bool:
-        """Check if this is a Gemns™ IoT device using new packet format."""
-        # Check manufacturer data for new Company ID
-        if discovery_info.manufacturer_data:
-            for manufacturer_id, data in discovery_info.manufacturer_data.items():
-                if manufacturer_id == BLE_COMPANY_ID and len(data) >= 20:
-                    return True
+    def _refresh_discovered_devices(self) -> None:
+        """Sync discovered devices with HA's Bluetooth discovery registry.
         
-        # Check name patterns as fallback
-        name = discovery_info.name or ""
-        if any(pattern in name.upper() for pattern in ["GEMNS", "GEMS"]):
-            return True
+        Devices that already have a config entry (or were ignored) are left
+        out of the selection.
+        """
+        current = _async_gems_service_infos(self.hass)
+        configured = self._async_current_ids()
+        # Sorted so the dropdown order is stable across renders
+        addresses = sorted(address for address in current if address not in configured)
+        known = self._state.discovered_devices
+        if addresses == list(known):
+            return
         
-        return False
-    
+        # Only devices that appeared since the last refresh are parsed and
+        # labelled; the rest keep their entry and option label
+        known_options = self._state.device_options
+        discovered_devices = {}
+        device_options = {}
+        for address in addresses:
+            if address in known:
+                discovered_devices[address] = known[address]
+                device_options[address] = known_options[address]
+                continue
+            # Extract device type from beacon data for better discovery display
+            device_type, device_name = self._extract_device_info_from_beacon(current[address])
+            discovered_devices[address] = {
+                "address": address,
+                "device_type": device_type,
+                "device_name": device_name,
+            }
+            device_options[address] = f"{device_name} ({address})"
+        
+        self._state.discovered_devices = discovered_devices
+        self._state.device_options = device_options
+        self._state.device_schema = None
+
     def _extract_device_info_from_beacon(self, discovery_info: BluetoothServiceInfo) -> tuple[str, str]:
         """Extract device type and name from beacon data."""
         try:
-            # Try to parse manufacturer data to get device type
-            if discovery_info.manufacturer_data:
-                for manufacturer_id, data in discovery_info.manufacturer_data.items():
-                    if manufacturer_id == BLE_COMPANY_ID and len(data) >= 20:
-                        # Try to parse the packet to get device type
-                        try:
-                            from .packet_parser import GemnsPacket
-                            packet = GemnsPacket(data)
-                            if packet.is_valid():
-                                device_type = packet.device_type
-                                
-                                # Map sensor type to device type and name
-                                device_type_map = {
-                                    0: ("legacy", "Legacy Device"),
-                                    1: ("button", "Button"),
-                                    2: ("vibration_sensor", "Vibration Monitor"),
-                                    3: ("two_way_switch", "Two-Way Switch"),
-                                    4: ("leak_sensor", "Leak Sensor"),
-                                }
-                                
-                                device_type, device_name = device_type_map.get(device_type, ("unknown", "IoT Device"))
-                                
-                                # Generate professional device name
-                                short_address = discovery_info.address.replace(":", "")[-6:].upper()
-                                device_number = int(short_address, 16) % 1000
-                                professional_name = f"Gemns™ IoT {device_name} Unit-{device_number:03d}"
-                                
-                                return device_type, professional_name
-                        except Exception as e:
-                            print(f"Error parsing beacon data: {e}")
-                            pass
+            # Try to parse manufacturer data to get device type (direct O(1) lookup)
+            data = discovery_info.manufacturer_data.get(BLE_COMPANY_ID)
+            if data is not None and len(data) >= 20:
+                # Try to parse the packet to get device type
+                try:
+                    packet = GemnsPacket(data)
+                    if packet.is_valid():
+                        device_type = packet.device_type
+                        
+                        # Map sensor type to device type and name prefix
+                        device_type, name_prefix = BEACON_DEVICE_TYPE_MAP.get(device_type, BEACON_UNKNOWN_DEVICE_TYPE)
+                        
+                        # Generate professional device name
+                        professional_name = name_prefix + professional_device_id(discovery_info.address)
+                        
+                        return device_type, professional_name
+                except Exception as e:
+                    print(f"Error parsing beacon data: {e}")
+                    pass
             
             # Fallback: use device name or generate generic name
             device_name = discovery_info.name or "Gemns™ IoT Device"
             if "Gemns" in device_name:
-                # Try to extract device type from name
-                if "Leak" in device_name or "leak" in device_name:
-                    return "leak_sensor", "Gemns™ IoT Leak Sensor"
-                elif "Vibration" in device_name or "vibration" in device_name:
-                    return "vibration_sensor", "Gemns™ IoT Vibration Monitor"
-                elif "Switch" in device_name or "switch" in device_name:
-                    return "two_way_switch", "Gemns™ IoT Two-Way Switch"
-                elif "Button" in device_name or "button" in device_name:
-                    return "button", "Gemns™ IoT Button"
+                # Try to extract device type from name in a single regex scan
+                if match := NAME_DEVICE_TYPE_RE.search(device_name):
+                    return NAME_DEVICE_TYPE_MAP[match.lastgroup]
             
             # Default fallback
             return "unknown", "Gemns™ IoT Device"
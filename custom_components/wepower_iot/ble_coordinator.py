@@ -4,16 +4,17 @@ from __future__ import annotations
 
 import logging
 import asyncio
-from datetime import datetime, timedelta
+import re
+import time
+from datetime import datetime
+from functools import lru_cache
 from typing import Any
-import struct
 
 from homeassistant.components.bluetooth import (
     BluetoothScanningMode,
     BluetoothServiceInfo,
     BluetoothServiceInfoBleak,
     BluetoothChange,
-    async_ble_device_from_address,
     async_last_service_info,
     async_discovered_service_info,
 )
@@ -22,15 +23,89 @@ from homeassistant.components.bluetooth.passive_update_coordinator import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.event import async_track_time_interval
 
-from .const import DOMAIN, BLE_COMPANY_ID, CONF_DECRYPTION_KEY, CONF_ADDRESS
+from .const import (
+    BLE_COMPANY_ID,
+    BLE_NAME_PATTERNS,
+    CONF_DECRYPTION_KEY,
+    CONF_ADDRESS,
+    MAC_SEPARATOR_TABLE,
+)
 from .packet_parser import parse_gems_packet
 
 _LOGGER = logging.getLogger(__name__)
 
-FALLBACK_POLL_INTERVAL = timedelta(seconds=10)
+# Number of decoded packets remembered per device; two covers devices that
+# alternate between an "on" and "off" frame
+PACKET_CACHE_SIZE = 2
+
+# Per-packet problems that a successfully decoded packet resolves; others,
+# like an unmapped device type, stay reported once for the coordinator's life
+DECODE_PROBLEMS = frozenset(
+    (
+        "parse_failed", "no_manufacturer_data", "invalid_length",
+        "empty_result", "decryption_failed",
+    )
+)
+
+# Company ID pre-formatted for log messages on the Gemns™ IoT path
+BLE_COMPANY_ID_HEX = f"0x{BLE_COMPANY_ID:04X}"
+
+# Advertised-name fallback, matched case-insensitively in a single scan
+BLE_NAME_RE = re.compile("|".join(map(re.escape, BLE_NAME_PATTERNS)), re.IGNORECASE)
+
+# Device type (from decrypted packet) -> (device_type key, display label)
+DEVICE_TYPE_MAP: dict[int, tuple[str, str]] = {
+    1: ("button", "Button"),
+    2: ("vibration_sensor", "Vibration Monitor"),
+    3: ("two_way_switch", "Two Way Switch"),
+    4: ("leak_sensor", "Leak Sensor"),
+    5: ("vibration_sensor", "Vibration Sensor"),
+    6: ("on_off_switch", "On/Off Switch"),
+    7: ("light_switch", "Light Switch"),
+    8: ("door_switch", "Door Switch"),
+    9: ("toggle_switch", "Toggle Switch"),
+}
+
+
+@lru_cache(maxsize=64)
+def professional_device_id(address: str) -> str:
+    """Generate the professional "Unit-NNN" identifier for a MAC address (cached)."""
+    # Low 24 bits of the MAC (its last three bytes); int() accepts either
+    # case, so no upper-cased copy is needed
+    if len(address) == 17:
+        # Canonical AA:BB:CC:DD:EE:FF - the bytes sit at fixed offsets
+        low_bytes = address[9:11] + address[12:14] + address[15:]
+    else:
+        low_bytes = address.translate(MAC_SEPARATOR_TABLE)[-6:]
+    device_number = int(low_bytes, 16) % 1000  # 0-999
+    return f"Unit-{device_number:03d}"
+
+
+def format_timestamp(timestamp: float | None) -> str | None:
+    """Format a coordinator data timestamp (epoch seconds) as an ISO string."""
+    # Advertisements only record time.time(); the string is built when an
+    # entity reads it, in the same format the data used to carry
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+def is_gems_device(discovery_info: BluetoothServiceInfo) -> bool:
+    """Check if this is a Gemns™ IoT device (shared by the coordinator and config flow)."""
+    # Check manufacturer data for Gemns™ IoT Company ID (22352)
+    data = discovery_info.manufacturer_data.get(BLE_COMPANY_ID)
+    if data is not None and len(data) >= 20:
+        _LOGGER.debug("✅ Found Gemns™ IoT device by manufacturer data: Company ID %s", BLE_COMPANY_ID_HEX)
+        return True
+    
+    # Check name patterns as fallback (weaker evidence than manufacturer data)
+    name = discovery_info.name
+    if name and BLE_NAME_RE.search(name):
+        _LOGGER.debug("✅ Found Gemns™ IoT device by name pattern: '%s'", name)
+        return True
+    
+    return False
 
 
 class GemnsBluetoothProcessorCoordinator(
@@ -38,6 +113,19 @@ class GemnsBluetoothProcessorCoordinator(
 ):
     """Coordinator for Gemns™ IoT Bluetooth devices."""
 
+    # Attributes read on every advertisement live in slots; the Home Assistant
+    # base classes still provide a __dict__ for their own state
+    __slots__ = (
+        "_entry",
+        "_decryption_key",
+        "_last_manufacturer_data",
+        "_packet_cache",
+        "_reported_problems",
+        "_names_address",
+        "_default_name",
+        "_device_names",
+    )
+
     def __init__(
         self,
         hass: HomeAssistant,
@@ -69,6 +157,51 @@ class GemnsBluetoothProcessorCoordinator(
         )
         self.data = {}
         self.last_update_success = True
+        
+        # Decode the decryption key once; it is refreshed when the entry is updated
+        self._decryption_key: bytes | None = self._decode_decryption_key(entry)
+
+        # Last raw Gemns™ IoT manufacturer payload, used to skip re-parsing duplicates
+        self._last_manufacturer_data: bytes | None = None
+        
+        # Recently decoded packets keyed by (payload, decryption key), reused when
+        # the same frame is decoded again without running decryption
+        self._packet_cache: dict[tuple[bytes, bytes | None], dict[str, Any]] = {}
+        
+        # Per-packet problems already logged at their full level; the
+        # DECODE_PROBLEMS are cleared once a packet decodes again so a
+        # recurrence is reported
+        self._reported_problems: set[str] = set()
+        
+        # Display names derived from the advertising address, rebuilt only when
+        # that address changes
+        self._names_address: str | None = None
+        self._default_name = ""
+        self._device_names: dict[int, tuple[str, str]] = {}
+
+    @staticmethod
+    def _decode_decryption_key(entry: ConfigEntry) -> bytes | None:
+        """Decode the hex decryption key stored in the config entry."""
+        key_hex = entry.data.get(CONF_DECRYPTION_KEY)
+        if not key_hex:
+            return None
+        try:
+            key = bytes.fromhex(key_hex)
+        except ValueError:
+            key = None
+        # AES only accepts 128/192/256-bit keys; reject others here rather than
+        # letting every packet fail inside the decryptor
+        if key is None or len(key) not in (16, 24, 32):
+            _LOGGER.warning("⚠️ Invalid decryption key for %s, packets will not be decrypted", entry.title)
+            return None
+        return key
+
+    async def async_entry_updated(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Refresh the cached decryption key when the config entry changes."""
+        self._decryption_key = self._decode_decryption_key(entry)
+        # Cached parse results were produced with the previous key
+        self._last_manufacturer_data = None
+        self._packet_cache.clear()
 
     async def async_init(self) -> None:
         """Initialize the coordinator."""
@@ -86,21 +219,17 @@ class GemnsBluetoothProcessorCoordinator(
         if service_info:
             _LOGGER.info("✅ Found recent advertisement for %s", self.address)
             # Process the existing advertisement data
-            parsed_data = self._parse_advertisement_data(service_info)
+            parsed_data = self._process_service_info(service_info)
             self.data = parsed_data
             self.last_update_success = True
         else:
             _LOGGER.info("ℹ️ No recent advertisement for %s - this is normal for event-driven devices", self.address)
-            # Don't fail setup - just mark as waiting for data
+            # Don't fail setup - keep available but mark as waiting for data
             self.data = {}
-            self.last_update_success = True
+            self.last_update_success = False
         
-        # Set up fallback polling for devices that don't advertise frequently
-        self._entry.async_on_unload(
-            async_track_time_interval(
-                self.hass, self._async_schedule_poll, FALLBACK_POLL_INTERVAL
-            )
-        )
+        # No fallback polling: Bluetooth advertisements and the unavailable
+        # tracking started by async_start() drive every listener update
         
         # Don't call parent async_init as it may raise ConfigEntryNotReady
         # for devices that don't advertise immediately
@@ -118,209 +247,228 @@ class GemnsBluetoothProcessorCoordinator(
         change: BluetoothChange,
     ) -> None:
         """Handle a Bluetooth event."""
-        super()._async_handle_bluetooth_event(service_info, change)
+        # self.data is updated first and the passive coordinator's handler
+        # called last, so its single listener notification carries this
+        # advertisement rather than the previous one
         try:
-            _LOGGER.info("🔵 BLE EVENT: %s | RSSI: %s | Name: %s | Change: %s", 
-                        self.address, service_info.rssi, service_info.name, change)
+            data = self.data
+            if self._is_repeated_frame(service_info):
+                # Same frame as last time - nothing to decode or log again. Only
+                # RSSI and last seen move, so publish them at most once per
+                # second instead of on every re-broadcast. Held-back repeats
+                # leave self.data untouched; the device is being seen, so the
+                # base handler has nothing to bookkeep for them either
+                now = time.time()
+                if int(now) == int(data["timestamp"]) and self.last_update_success:
+                    return
+                self.data = {**data, "rssi": service_info.rssi, "timestamp": now}
+            else:
+                _LOGGER.info("🔵 BLE EVENT: %s | RSSI: %s | Name: %s | Change: %s", 
+                            self.address, service_info.rssi, service_info.name, change)
+                
+                # Each advertisement is parsed and dispatched on its own rather than
+                # batched per loop tick: distinct frames carry button/switch events
+                # that must not be coalesced, and repeats are already served by the
+                # frame memo without decoding. The frame was just found to be new,
+                # so parse it directly rather than re-checking the memo
+                parsed_data = self._parse_advertisement_data(service_info)
+                self._last_manufacturer_data = service_info.manufacturer_data.get(BLE_COMPANY_ID)
+                self.data = parsed_data
+
+                _LOGGER.info("🟢 BLE DATA PARSED: %s | Data: %s", self.address, parsed_data)
             
-            # Parse the advertisement data and update our data
-            parsed_data = self._parse_advertisement_data(service_info)
-            self.data = parsed_data
             self.last_update_success = True
             
-            _LOGGER.info("🟢 BLE DATA PARSED: %s | Data: %s", self.address, parsed_data)
-            self.async_update_listeners()
-            
         except Exception as e:
             self.last_update_success = False
             _LOGGER.error("🔴 BLE PARSE ERROR: %s | Error: %s", self.address, e)
+            return
+        
+        super()._async_handle_bluetooth_event(service_info, change)
+
+    def _process_service_info(self, service_info: BluetoothServiceInfo) -> dict[str, Any]:
+        """Return parsed data for an advertisement, reusing the last parse for a repeated frame."""
+        if self._is_repeated_frame(service_info):
+            # Keep the previous parse, with the per-advertisement fields
+            # refreshed in a new dict rather than in place
+            return {**self.data, "rssi": service_info.rssi, "timestamp": time.time()}
+
+        # Parse the advertisement data and remember the frame it came from
+        parsed_data = self._parse_advertisement_data(service_info)
+        self._last_manufacturer_data = service_info.manufacturer_data.get(BLE_COMPANY_ID)
+        return parsed_data
+
+    def _is_repeated_frame(self, service_info: BluetoothServiceInfo) -> bool:
+        """Return if this advertisement carries the last parsed frame again."""
+        # Beacons re-broadcast the same frame many times; the previous parse
+        # still applies and only RSSI and last seen differ
+        manufacturer_data = service_info.manufacturer_data.get(BLE_COMPANY_ID)
+        return (
+            manufacturer_data is not None
+            and manufacturer_data == self._last_manufacturer_data
+            and bool(self.data)
+        )
 
     def _parse_advertisement_data(self, service_info: BluetoothServiceInfo) -> dict[str, Any]:
         """Parse Gemns™ IoT advertisement data using new packet format."""
-        # Get professional device ID
-        clean_address = service_info.address.replace(":", "").upper()
-        last_6 = clean_address[-6:]
-        device_number = int(last_6, 16) % 1000  # Get a number between 0-999
-        professional_id = f"Unit-{device_number:03d}"
+        # Bind hot-path attributes to locals once per advertisement
+        address = self.address
+        log_info = _LOGGER.info
+        log_enabled = _LOGGER.isEnabledFor(logging.INFO)
+        all_manufacturer_data = service_info.manufacturer_data
+        rssi = service_info.rssi
         
-        data = {
-            "address": service_info.address,
-            "name": service_info.name or f"Gemns™ IoT Device {professional_id}",
-            "rssi": service_info.rssi,
-            "timestamp": datetime.now().isoformat(),
-            "device_type": "unknown",
-            "sensor_data": {},
-            "battery_level": None,
-            "signal_strength": service_info.rssi,
-        }
+        if service_info.address != self._names_address:
+            self._build_device_names(service_info.address)
         
         # Parse manufacturer data for Gemns™ IoT devices using new packet format
-        if service_info.manufacturer_data:
-            _LOGGER.info("📡 MANUFACTURER DATA: %s | IDs: %s", self.address, list(service_info.manufacturer_data.keys()))
-            for manufacturer_id, manufacturer_data in service_info.manufacturer_data.items():
-                _LOGGER.info("🏭 MANUFACTURER: %s | ID: 0x%04X | Data: %s", 
-                            self.address, manufacturer_id, manufacturer_data.hex())
-                if manufacturer_id == BLE_COMPANY_ID:  # Gemns™ IoT manufacturer ID (0x5750)
-                    _LOGGER.info("✅ GEMNS™ IOT DEVICE DETECTED: %s | Parsing data...", self.address)
-                    parsed_data = self._parse_gems_manufacturer_data(manufacturer_data)
-                    if parsed_data:
-                        data.update(parsed_data)
-                        _LOGGER.info("🎯 GEMNS™ IOT DATA PARSED: %s | Result: %s", self.address, parsed_data)
-                    else:
-                        _LOGGER.warning("⚠️ GEMNS™ IOT PARSE FAILED: %s | Data: %s", self.address, manufacturer_data.hex())
+        parsed_data: dict[str, Any] = {}
+        if all_manufacturer_data:
+            if log_enabled:
+                log_info("📡 MANUFACTURER DATA: %s | IDs: %s", address, list(all_manufacturer_data))
+            # Direct lookup of the Gemns™ IoT manufacturer ID (0x5750) instead of
+            # iterating every manufacturer in the advertisement
+            manufacturer_data = all_manufacturer_data.get(BLE_COMPANY_ID)
+            if manufacturer_data is not None:
+                if log_enabled:
+                    log_info("✅ GEMNS™ IOT DEVICE DETECTED: %s | Parsing data...", address)
+                parsed_data = self._parse_gems_manufacturer_data(manufacturer_data)
+                if parsed_data:
+                    if log_enabled:
+                        log_info("🎯 GEMNS™ IOT DATA PARSED: %s | Result: %s", address, parsed_data)
                 else:
-                    _LOGGER.debug("❌ NON-GEMNS™ IOT: %s | ID: 0x%04X", self.address, manufacturer_id)
+                    self._log_packet_problem(
+                        logging.WARNING, "parse_failed",
+                        "⚠️ GEMNS™ IOT PARSE FAILED: %s | Data: %s", address, manufacturer_data.hex(),
+                    )
+            else:
+                _LOGGER.debug("❌ NON-GEMNS™ IOT: %s", address)
         else:
-            _LOGGER.warning("⚠️ NO MANUFACTURER DATA: %s", self.address)
+            self._log_packet_problem(logging.WARNING, "no_manufacturer_data", "⚠️ NO MANUFACTURER DATA: %s", address)
         
         # Determine device type based on sensor type
-        if 'sensor_data' in data and 'device_type' in data['sensor_data']:
-            device_type = data['sensor_data']['device_type']
-            _LOGGER.info("🔍 DEVICE TYPE DETECTION: device_type=%d (0x%04X)", device_type, device_type)
-            if device_type == 1:
-                data["device_type"] = "button"
-                data["name"] = f"Gemns™ IoT Button {professional_id}"
-                _LOGGER.info("  ✅ Identified as: button")
-            elif device_type == 2:
-                data["device_type"] = "vibration_sensor"
-                data["name"] = f"Gemns™ IoT Vibration Monitor {professional_id}"
-                _LOGGER.info("  ✅ Identified as: vibration_sensor")
-            elif device_type == 3:
-                data["device_type"] = "two_way_switch"
-                data["name"] = f"Gemns™ IoT Two Way Switch {professional_id}"
-                _LOGGER.info("  ✅ Identified as: two_way_switch")
-            elif device_type == 4:
-                data["device_type"] = "leak_sensor"
-                data["name"] = f"Gemns™ IoT Leak Sensor {professional_id}"
-                _LOGGER.info("  ✅ Identified as: leak_sensor")
-            elif device_type == 5:
-                data["device_type"] = "vibration_sensor"
-                data["name"] = f"Gemns™ IoT Vibration Sensor {professional_id}"
-                _LOGGER.info("  ✅ Identified as: vibration_sensor")
-            elif device_type == 6:
-                data["device_type"] = "on_off_switch"
-                data["name"] = f"Gemns™ IoT On/Off Switch {professional_id}"
-                _LOGGER.info("  ✅ Identified as: on_off_switch")
-            elif device_type == 7:
-                data["device_type"] = "light_switch"
-                data["name"] = f"Gemns™ IoT Light Switch {professional_id}"
-                _LOGGER.info("  ✅ Identified as: light_switch")
-            elif device_type == 8:
-                data["device_type"] = "door_switch"
-                data["name"] = f"Gemns™ IoT Door Switch {professional_id}"
-                _LOGGER.info("  ✅ Identified as: door_switch")
-            elif device_type == 9:
-                data["device_type"] = "toggle_switch"
-                data["name"] = f"Gemns™ IoT Toggle Switch {professional_id}"
-                _LOGGER.info("  ✅ Identified as: toggle_switch")
+        sensor_data = parsed_data.get("sensor_data", {})
+        device_type_name = "unknown"
+        name = service_info.name or self._default_name
+        device_type = sensor_data.get('device_type')
+        if device_type is not None:
+            if log_enabled:
+                log_info("🔍 DEVICE TYPE DETECTION: device_type=%d (0x%04X)", device_type, device_type)
+            device_info = self._device_names.get(device_type)
+            if device_info is not None:
+                device_type_name, name = device_info
+                if log_enabled:
+                    log_info("  ✅ Identified as: %s", device_type_name)
             else:
-                _LOGGER.warning("  ⚠️ Unknown device type: %d (0x%04X)", device_type, device_type)
+                self._log_packet_problem(
+                    logging.WARNING, f"unknown_device_type_{device_type}",
+                    "  ⚠️ Unknown device type: %d (0x%04X)", device_type, device_type,
+                )
+        
+        # Build the result in one literal now that every field is known
+        data = {
+            "address": service_info.address,
+            "name": name,
+            "rssi": rssi,
+            "timestamp": time.time(),
+            "device_type": device_type_name,
+            "sensor_data": sensor_data,
+            "battery_level": parsed_data.get("battery_level"),
+        }
         
         return data
 
+    def _build_device_names(self, address: str) -> None:
+        """Precompute the professional ID and per-device-type names for an address."""
+        professional_id = professional_device_id(address)
+        
+        self._names_address = address
+        self._default_name = f"Gemns™ IoT Device {professional_id}"
+        self._device_names = {
+            device_type: (device_type_name, f"Gemns™ IoT {device_label} {professional_id}")
+            for device_type, (device_type_name, device_label) in DEVICE_TYPE_MAP.items()
+        }
+
     def _parse_gems_manufacturer_data(self, data: bytes) -> dict[str, Any]:
         """Parse Gemns™ IoT manufacturer data using 18-byte packet format."""
-        _LOGGER.info("🔐 PARSING GEMNS DATA: Length=%d | Data=%s", len(data), data.hex())
-        
-        if len(data) < 18:  # Gemns™ IoT packet format is 18 bytes
-            _LOGGER.warning("⚠️ INVALID PACKET LENGTH: %d bytes (expected 18)", len(data))
-            return {}
-        
         # Parse packet structure: HA BLE driver filters out Company ID (2 bytes)
-        # So we receive: Flags (1) + Encrypted Data (16) + CRC (1) = 18 bytes
-        if len(data) < 18:
-            _LOGGER.error("🔴 PACKET TOO SHORT: %d bytes (need 18)", len(data))
+        # So we receive: Flags (1) + Encrypted Data (16) + CRC (1) = 18 bytes.
+        # Reject short frames before doing any other work
+        data_len = len(data)
+        if data_len < 18:
+            self._log_packet_problem(
+                logging.WARNING, "invalid_length",
+                "⚠️ INVALID PACKET LENGTH: %d bytes (expected 18)", data_len,
+            )
             return {}
         
-        _LOGGER.info("🔍 PACKET DEBUG: Length=%d, Data=%s", len(data), data.hex())
+        log_info = _LOGGER.info
+        # Only hexlify the payload when info logging is actually enabled
+        log_enabled = _LOGGER.isEnabledFor(logging.INFO)
+        if log_enabled:
+            log_info("🔐 PARSING GEMNS DATA: Length=%d | Data=%s", data_len, data.hex())
         
-        try:
-            # Company ID is already filtered by HA BLE driver (0x5750)
-            company_id = 0x5750  # Gemns™ IoT company ID (filtered by HA)
-            flags = data[0]  # 1 byte
-            encrypted_data = data[1:17]  # 16 bytes (positions 1-16)
-            crc = data[17]  # 1 byte (position 17, last byte)
-            
-            _LOGGER.info("📦 PACKET STRUCTURE: Company ID=0x%04X (filtered by HA), Flags=0x%02X, CRC=0x%02X", 
-                        company_id, flags, crc)
-            _LOGGER.info("🔐 ENCRYPTED DATA (%d bytes): %s", len(encrypted_data), encrypted_data.hex())
-            
-        except (IndexError, struct.error) as e:
-            _LOGGER.error("🔴 PACKET PARSING ERROR: %s", e)
-            return {}
+        # Re-transmitted frame: reuse the result decoded with the same key
+        decryption_key = self._decryption_key
+        cache_key = (data, decryption_key)
+        packet_cache = self._packet_cache
+        cached = packet_cache.pop(cache_key, None)
+        if cached is not None:
+            packet_cache[cache_key] = cached  # Mark as most recently used
+            return cached
         
-        # Get decryption key from config entry
-        decryption_key = None
-        if hasattr(self._entry, 'data') and CONF_DECRYPTION_KEY in self._entry.data:
-            try:
-                decryption_key = bytes.fromhex(self._entry.data[CONF_DECRYPTION_KEY])
-                _LOGGER.info("🔑 DECRYPTION KEY: %s", self._entry.data[CONF_DECRYPTION_KEY])
-            except ValueError:
-                _LOGGER.error("🔴 INVALID DECRYPTION KEY FORMAT: %s", self._entry.data[CONF_DECRYPTION_KEY])
-        else:
-            _LOGGER.warning("⚠️ NO DECRYPTION KEY FOUND in config entry")
+        if log_enabled:
+            # Company ID is already filtered by HA BLE driver (0x5750); the length
+            # check above guarantees these indexes exist
+            log_info("📦 PACKET STRUCTURE: Company ID=%s (filtered by HA), Flags=0x%02X, CRC=0x%02X", 
+                        BLE_COMPANY_ID_HEX, data[0], data[17])
+            log_info("🔐 ENCRYPTED DATA (%d bytes): %s", 16, memoryview(data)[1:17].hex())
+            log_info("📦 CALLING PACKET PARSER: key=%s", "configured" if decryption_key else "None")
         
         # Parse the full 18-byte packet using the parser
-        _LOGGER.info("📦 CALLING PACKET PARSER: packet_data=%s, key=%s", 
-                    data.hex(), decryption_key.hex() if decryption_key else "None")
-        
         parsed_packet = parse_gems_packet(data, decryption_key)
         
         if not parsed_packet:
-            _LOGGER.error("🔴 PACKET PARSER RETURNED EMPTY RESULT")
+            self._log_packet_problem(logging.ERROR, "empty_result", "🔴 PACKET PARSER RETURNED EMPTY RESULT")
             return {}
         
-        _LOGGER.info("✅ PACKET PARSED SUCCESSFULLY: %s", parsed_packet)
+        # The parser only logs its failures at debug; report them here once
+        sensor_data = parsed_packet.get("sensor_data")
+        decryption_failed = sensor_data is None and decryption_key is not None
+        if decryption_failed:
+            self._log_packet_problem(
+                logging.WARNING, "decryption_failed",
+                "⚠️ GEMNS™ IOT DECRYPTION FAILED: %s", self.address,
+            )
         
-        result = {
-            "company_id": company_id,
-            "flags": flags,
-            "crc": crc,
-            "packet_structure": {
-                "company_id": company_id,
-                "flags": flags,
-                "encrypted_data_length": len(encrypted_data),
-                "crc": crc,
-            }
-        }
+        # Consumers only read sensor_data, so don't copy the packet header,
+        # decrypted fields or promoted sensor values into the result
+        result = {"sensor_data": sensor_data or {}}
         
-        # Add decrypted data if available
-        if 'decrypted_data' in parsed_packet:
-            result['decrypted_data'] = parsed_packet['decrypted_data']
-            _LOGGER.info("🔓 DECRYPTED DATA: %s", parsed_packet['decrypted_data'])
+        if len(packet_cache) >= PACKET_CACHE_SIZE:
+            del packet_cache[next(iter(packet_cache))]
+        packet_cache[cache_key] = result
+        if not decryption_failed:
+            self._reported_problems -= DECODE_PROBLEMS
         
-        # Add sensor data if available
-        if 'sensor_data' in parsed_packet:
-            result['sensor_data'] = parsed_packet['sensor_data']
-            _LOGGER.info("📊 SENSOR DATA: %s", parsed_packet['sensor_data'])
-            
-            # Extract specific sensor values
-            sensor_data = parsed_packet['sensor_data']
-            if 'leak_detected' in sensor_data:
-                result['leak_detected'] = sensor_data['leak_detected']
-                _LOGGER.info("💧 LEAK DETECTED: %s", sensor_data['leak_detected'])
-            if 'event_counter' in sensor_data:
-                result['event_counter'] = sensor_data['event_counter']
-                _LOGGER.info("🔢 EVENT COUNTER: %s", sensor_data['event_counter'])
-            if 'sensor_event' in sensor_data:
-                result['sensor_event'] = sensor_data['sensor_event']
-                _LOGGER.info("📡 SENSOR EVENT: %s", sensor_data['sensor_event'])
-        
-        _LOGGER.info("🎯 FINAL RESULT: %s", result)
         return result
 
+    def _log_packet_problem(self, level: int, problem: str, msg: str, *args: Any) -> None:
+        """Log a per-packet problem at level once, then at debug until it is cleared."""
+        if problem in self._reported_problems:
+            _LOGGER.debug(msg, *args)
+            return
+        self._reported_problems.add(problem)
+        _LOGGER.log(level, msg, *args)
+
     @callback
-    def _async_schedule_poll(self, _: datetime) -> None:
-        """Schedule a poll of the device."""
-        # Simple restart detection: if device exists but no data, default to off
-        if self.data:
-            self.last_update_success = True
-            self.async_update_listeners()
-        else:
-            # Device exists but no data (restart scenario) - keep available but no data
-            self.last_update_success = False
-            _LOGGER.debug("ℹ️ Device %s exists but no data - keeping available but no data (restart scenario)", self.address)
-            self.async_update_listeners()
+    def _async_handle_unavailable(self, service_info: BluetoothServiceInfoBleak) -> None:
+        """Handle the device no longer being seen by any Bluetooth scanner."""
+        # Entities stay available (event-driven devices may be silent for a long
+        # time); only flag that the last data is stale. The base class notifies
+        # listeners on this transition.
+        self.last_update_success = False
+        super()._async_handle_unavailable(service_info)
     
     async def _discover_and_update_address(self) -> None:
         """Discover Gemns™ IoT devices and update the address if found."""
@@ -331,7 +479,7 @@ class GemnsBluetoothProcessorCoordinator(
             _LOGGER.info("🔍 Found %d total Bluetooth devices", len(discovered_devices))
             for device in discovered_devices:
                 _LOGGER.info("🔍 Checking device: %s (%s)", device.name, device.address)
-                if self._is_gems_device(device):
+                if is_gems_device(device):
                     _LOGGER.info("🎯 Found Gemns™ IoT device: %s (%s)", device.name, device.address)
                     # Update the config entry with the real MAC address
                     new_data = self._entry.data.copy()
@@ -359,25 +507,6 @@ class GemnsBluetoothProcessorCoordinator(
             _LOGGER.info("🔄 Retrying discovery...")
             await self._discover_and_update_address()
     
-    def _is_gems_device(self, discovery_info: BluetoothServiceInfo) -> bool:
-        """Check if this is a Gemns™ IoT device."""
-        # Check manufacturer data for Gemns™ IoT Company ID (22352)
-        if discovery_info.manufacturer_data:
-            for manufacturer_id, data in discovery_info.manufacturer_data.items():
-                _LOGGER.info("🔍 Checking manufacturer data: Company ID %d, Data length: %d", manufacturer_id, len(data))
-                if manufacturer_id == BLE_COMPANY_ID and len(data) >= 20:
-                    _LOGGER.info("✅ Found Gemns™ IoT device by manufacturer data")
-                    return True
-        
-        # Check name patterns as fallback
-        name = discovery_info.name or ""
-        _LOGGER.info("🔍 Checking device name: '%s'", name)
-        if any(pattern in name.upper() for pattern in ["GEMNS", "GEMS"]):
-            _LOGGER.info("✅ Found Gemns™ IoT device by name pattern")
-            return True
-        
-        return False
-    
     async def _update_coordinator_address(self, new_address: str) -> None:
         """Update the coordinator's address dynamically."""
         try:
@@ -385,12 +514,13 @@ class GemnsBluetoothProcessorCoordinator(
             
             # Update the address
             self.address = new_address
+            self._last_manufacturer_data = None
             
             # Try to connect to the new address
             if service_info := async_last_service_info(self.hass, self.address):
                 _LOGGER.info("✅ Successfully connected to device at %s", self.address)
                 # Process the advertisement data
-                parsed_data = self._parse_advertisement_data(service_info)
+                parsed_data = self._process_service_info(service_info)
                 self.data = parsed_data
                 self.last_update_success = True
                 self.async_update_listeners()
@@ -406,5 +536,6 @@ class GemnsBluetoothProcessorCoordinator(
         _LOGGER.info("🔴 Shutting down Gemns™ IoT BLE coordinator")
         # Clean up any resources if needed
         self.data = {}
+        self._last_manufacturer_data = None
         self.last_update_success = False
 
@@ -2,8 +2,7 @@
 """BLE sensor platform for Gemns™ IoT integration."""
 
 import logging
-from typing import Any, Dict, Optional
-from datetime import datetime, timezone
+from typing import Any, Dict
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -13,22 +12,72 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.const import (
-    CONF_DEVICE_ID,
-    CONF_NAME,
-    CONF_UNIT_OF_MEASUREMENT,
     PERCENTAGE,
     UnitOfTemperature,
     UnitOfPressure,
-    CONCENTRATION_PARTS_PER_MILLION,
 )
 
-from .const import DOMAIN, CONF_ADDRESS, CONF_NAME
-from .ble_coordinator import GemnsBluetoothProcessorCoordinator
+from .const import DOMAIN, CONF_ADDRESS, CONF_NAME, STATE_WRITE_COOLDOWN
+from .ble_coordinator import (
+    GemnsBluetoothProcessorCoordinator,
+    format_timestamp,
+    professional_device_id,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Device type -> model shown in the device registry
+DEVICE_MODEL_MAP = {
+    "leak_sensor": "Leak Sensor",
+    "button": "Button",
+    "two_way_switch": "Two Way Switch",
+    "vibration_sensor": "Vibration Sensor",
+    "on_off_switch": "On/Off Switch",
+    "light_switch": "Light Switch",
+    "door_switch": "Door Switch",
+    "toggle_switch": "Toggle Switch",
+    "unknown_device": "IoT Device",
+}
+
+# Device type -> MDI icon
+DEVICE_ICON_MAP = {
+    "temperature_sensor": "mdi:thermometer",
+    "humidity_sensor": "mdi:water-percent", 
+    "pressure_sensor": "mdi:gauge",
+    "vibration_sensor": "mdi:vibrate",
+    "leak_sensor": "mdi:water",
+    "on_off_switch": "mdi:toggle-switch",
+    "light_switch": "mdi:lightbulb",
+    "door_switch": "mdi:door",
+    "toggle_switch": "mdi:toggle-switch",
+}
+
+# Device type substring -> (device class, unit, name label, icon, sensor_data
+# value key), checked in order; None marks types that belong to another platform
+SENSOR_PROPERTIES_TABLE = (
+    ("leak", None),
+    ("switch", None),
+    ("temperature", (SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS, "Button", "mdi:thermometer", "temperature")),
+    ("humidity", (SensorDeviceClass.HUMIDITY, PERCENTAGE, "Vibration Monitor", "mdi:water-percent", "humidity")),
+    ("pressure", (SensorDeviceClass.PRESSURE, UnitOfPressure.HPA, "Two Way Switch", "mdi:gauge", "pressure")),
+    # Home Assistant has no vibration sensor device class
+    ("vibration", (None, "m/s²", "Vibration Sensor", "mdi:vibrate", "vibration")),
+)
+GENERIC_SENSOR_PROPERTIES = (None, None, "Sensor", "mdi:chip", None)
+
+
+def rssi_to_percentage(rssi: int) -> float:
+    """Convert RSSI to a signal percentage (rough approximation)."""
+    # RSSI typically ranges from -100 (very weak) to -30 (very strong)
+    return round(max(0, min(100, (rssi + 100) * 100 / 70)), 1)
+
+
+# Integer RSSI (dBm) -> signal percentage over the range scanners report
+RSSI_PERCENTAGE_MAP = {rssi: rssi_to_percentage(rssi) for rssi in range(-127, 21)}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -126,7 +175,7 @@ class GemnsBLESensor(SensorEntity):
         # Don't store address statically - get it dynamically from config data
         
         # Set up basic entity properties
-        self._attr_name = config_entry.data.get(CONF_NAME, f"Gemns™ IoT Device")
+        self._attr_name = config_entry.data.get(CONF_NAME, "Gemns™ IoT Device")
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}"
         self._attr_should_poll = False
         
@@ -148,6 +197,14 @@ class GemnsBLESensor(SensorEntity):
         
         # Device type will be determined from coordinator data
         self._device_type = "unknown"
+        self._properties_key = None
+        self._device_info_key = None
+        # sensor_data key holding this device type's reading, if it has one
+        self._value_key = None
+        self._last_signature = None
+        # Attributes are rebuilt only when the state signature changes instead
+        # of on every read of extra_state_attributes
+        self._attr_extra_state_attributes = self._build_extra_state_attributes()
         
     @property
     def address(self) -> str:
@@ -159,9 +216,8 @@ class GemnsBLESensor(SensorEntity):
         """Return if entity is available."""
         return self.coordinator.available and self._attr_available
 
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return entity specific state attributes."""
+    def _build_extra_state_attributes(self) -> Dict[str, Any]:
+        """Build entity specific state attributes from the coordinator data."""
         attrs = {
             "address": self.address,
             "device_type": self._device_type,
@@ -175,21 +231,23 @@ class GemnsBLESensor(SensorEntity):
         }
         
         # Add data from coordinator if available
-        if self.coordinator.data:
+        data = self.coordinator.data
+        if data:
+            available = self.coordinator.available
             attrs.update({
-                "rssi": self.coordinator.data.get("rssi"),
-                "signal_strength": self.coordinator.data.get("signal_strength"),
-                "battery_level": self.coordinator.data.get("battery_level"),
-                "last_seen": self.coordinator.data.get("timestamp"),
+                "rssi": data.get("rssi"),
+                "signal_strength": data.get("rssi"),
+                "battery_level": data.get("battery_level"),
+                "last_seen": format_timestamp(data.get("timestamp")),
                 "ble_active": True,  # If we have data, BLE is active
-                "ble_connected": self.coordinator.available,  # Use coordinator availability
-                "ble_status": "active" if self.coordinator.available else "inactive",
-                "last_update_success": getattr(self.coordinator, 'last_update_success', True),
+                "ble_connected": available,  # Use coordinator availability
+                "ble_status": "active" if available else "inactive",
+                "last_update_success": self.coordinator.last_update_success,
             })
             
             # Add sensor-specific attributes
-            if "sensor_data" in self.coordinator.data:
-                sensor_data = self.coordinator.data["sensor_data"]
+            sensor_data = data.get("sensor_data")
+            if sensor_data:
                 if "leak_detected" in sensor_data:
                     attrs["leak_detected"] = sensor_data["leak_detected"]
                 if "event_counter" in sensor_data:
@@ -201,7 +259,23 @@ class GemnsBLESensor(SensorEntity):
 
     async def async_added_to_hass(self) -> None:
         """Call when entity is added to hass."""
+        # Prime state from data the coordinator already has, so the initial
+        # state write carries it and an identical first callback is skipped
+        if self.coordinator.data:
+            self._update_from_coordinator()
+            self._last_signature = self._state_signature()
+            self._attr_extra_state_attributes = self._build_extra_state_attributes()
         await super().async_added_to_hass()
+        # Attribute-only changes (RSSI, last seen, counters) are coalesced into
+        # one trailing state write per cooldown
+        self._attributes_debouncer = Debouncer(
+            self.hass,
+            _LOGGER,
+            cooldown=STATE_WRITE_COOLDOWN,
+            immediate=True,
+            function=self.async_write_ha_state,
+        )
+        self.async_on_remove(self._attributes_debouncer.async_cancel)
         # Register with coordinator to receive updates
         self._unsub_coordinator = self.coordinator.async_add_listener(self._handle_coordinator_update)
         # Set up cleanup when entity is removed
@@ -211,25 +285,57 @@ class GemnsBLESensor(SensorEntity):
         """Handle updated data from the coordinator."""
         try:
             self._update_from_coordinator()
-            self.async_write_ha_state()
+            # Skip the state write when nothing shown in the state or its
+            # attributes changed since the last one
+            signature = self._state_signature()
+            last_signature = self._last_signature
+            if signature == last_signature:
+                return
+            self._last_signature = signature
+            self._attr_extra_state_attributes = self._build_extra_state_attributes()
+            
+            # State, availability and device type changes are written at once so
+            # no transition is lost; the write also carries pending attributes
+            if last_signature is None or signature[:4] != last_signature[:4]:
+                self._attributes_debouncer.async_cancel()
+                self.async_write_ha_state()
+            else:
+                self._attributes_debouncer.async_schedule_call()
         except Exception as e:
             _LOGGER.error("Error handling coordinator update for %s: %s", self.address, e)
 
+    def _state_signature(self) -> tuple:
+        """Return the values the entity state and attributes are built from."""
+        data = self.coordinator.data or {}
+        return (
+            self._attr_native_value,
+            self._attr_available,
+            self._device_type,
+            self.coordinator.last_update_success,
+            data.get("rssi"),
+            data.get("battery_level"),
+            data.get("timestamp"),
+            data.get("sensor_data"),
+        )
+
     def _update_from_coordinator(self) -> None:
         """Update sensor state from coordinator data."""
-        if not self.coordinator.data:
+        log_enabled = _LOGGER.isEnabledFor(logging.INFO)
+        data = self.coordinator.data
+        if not data:
             # Simple restart detection: if device exists but no data, keep available but no value
             self._attr_available = True  # Keep available, just no data
             self._attr_native_value = None
             _LOGGER.debug("BLE sensor %s: No coordinator data - device available but no data (restart scenario)", self.address)
             return
             
-        data = self.coordinator.data
-        _LOGGER.info("🔄 UPDATING SENSOR: %s | Coordinator data: %s", self.address, data)
+        if log_enabled:
+            _LOGGER.info("🔄 UPDATING SENSOR: %s | Coordinator data: %s", self.address, data)
         
         # Update device type
         self._device_type = data.get("device_type", "unknown")
-        _LOGGER.info("🏷️ DEVICE TYPE: %s | Type: %s", self.address, self._device_type)
+        if log_enabled:
+            _LOGGER.info("🏷️ DEVICE TYPE: %s | Type: %s", self.address, self._device_type)
         
         # Set sensor properties based on device type
         self._set_sensor_properties()
@@ -242,81 +348,56 @@ class GemnsBLESensor(SensorEntity):
         
         # Update availability
         self._attr_available = True
-        _LOGGER.info("✅ SENSOR UPDATED: %s | Available: %s | Value: %s | BLE_active: %s | Coordinator_available: %s", 
-                     self.address, self._attr_available, self._attr_native_value, True, self.coordinator.available)
+        if log_enabled:
+            _LOGGER.info("✅ SENSOR UPDATED: %s | Available: %s | Value: %s | BLE_active: %s | Coordinator_available: %s", 
+                         self.address, self._attr_available, self._attr_native_value, True, self.coordinator.available)
         
     def _set_sensor_properties(self) -> None:
         """Set sensor properties based on device type."""
         device_type = self._device_type.lower()
+
+        # Name, icon and classes depend only on the device type and address,
+        # so the formatted name is only rebuilt when one of them changes
+        properties_key = (device_type, self.address)
+        if properties_key == self._properties_key:
+            return
+        self._properties_key = properties_key
         
-        # Reset to defaults
-        self._attr_device_class = None
         self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_unit_of_measurement = None
-        self._attr_icon = None
         
-        # Get short address for display
-        short_address = self.address.replace(":", "")[-6:].upper()
+        # First matching device type substring wins
+        for pattern, properties in SENSOR_PROPERTIES_TABLE:
+            if pattern in device_type:
+                break
+        else:
+            properties = GENERIC_SENSOR_PROPERTIES
         
-        # Set properties based on device type
-        # Skip leak sensors - they should be handled by binary sensor
-        if "leak" in device_type:
-            # Don't create sensor entities for leak sensors
-            return
-            
-        # Skip switch devices - they should be handled by switch platform
-        if "switch" in device_type:
-            # Don't create sensor entities for switch devices
+        if properties is None:
+            # Leak sensors and switches are handled by the binary sensor and
+            # switch platforms - don't set sensor properties for them
+            self._attr_device_class = None
+            self._attr_native_unit_of_measurement = None
+            self._attr_icon = None
+            self._value_key = None
             return
-            
-        if "temperature" in device_type:
-            self._attr_device_class = SensorDeviceClass.TEMPERATURE
-            self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-            self._attr_name = f"Gemns™ IoT Button {self._get_professional_device_id()}"
-            self._attr_icon = "mdi:thermometer"
-            
-        elif "humidity" in device_type:
-            self._attr_device_class = SensorDeviceClass.HUMIDITY
-            self._attr_native_unit_of_measurement = PERCENTAGE
-            self._attr_name = f"Gemns™ IoT Vibration Monitor {self._get_professional_device_id()}"
-            self._attr_icon = "mdi:water-percent"
-            
-        elif "pressure" in device_type:
-            self._attr_device_class = SensorDeviceClass.PRESSURE
-            self._attr_native_unit_of_measurement = UnitOfPressure.HPA
-            self._attr_name = f"Gemns™ IoT Two Way Switch {self._get_professional_device_id()}"
-            self._attr_icon = "mdi:gauge"
-            
-        elif "vibration" in device_type:
-            self._attr_device_class = SensorDeviceClass.VIBRATION
-            self._attr_native_unit_of_measurement = "m/s²"
-            self._attr_name = f"Gemns™ IoT Vibration Sensor {self._get_professional_device_id()}"
-            self._attr_icon = "mdi:vibrate"
-            
-        else:
-            # Generic sensor
-            self._attr_name = f"Gemns™ IoT Sensor {self._get_professional_device_id()}"
-            self._attr_icon = "mdi:chip"
+        
+        device_class, unit, label, icon, self._value_key = properties
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit
+        self._attr_name = f"Gemns™ IoT {label} {self._get_professional_device_id()}"
+        self._attr_icon = icon
 
     def _update_device_info(self) -> None:
         """Update device info with proper name and model."""
         device_type = self._device_type.lower()
         
-        # Set model based on device type
-        model_map = {
-            "leak_sensor": "Leak Sensor",
-            "button": "Button",
-            "vibration_sensor": "Vibration Monitor",
-            "two_way_switch": "Two Way Switch",
-            "vibration_sensor": "Vibration Sensor",
-            "on_off_switch": "On/Off Switch",
-            "light_switch": "Light Switch",
-            "door_switch": "Door Switch",
-            "toggle_switch": "Toggle Switch",
-            "unknown_device": "IoT Device"
-        }
+        # Keep the existing DeviceInfo unless something it is built from changed
+        device_info_key = (device_type, self.address, self._attr_name)
+        if device_info_key == self._device_info_key:
+            return
+        self._device_info_key = device_info_key
         
-        model = model_map.get(device_type, "IoT Sensor")
+        model = DEVICE_MODEL_MAP.get(device_type, "IoT Sensor")
         
         # Set device image based on device type
         device_image = self._get_device_image(device_type)
@@ -334,77 +415,60 @@ class GemnsBLESensor(SensorEntity):
         if device_image:
             self._attr_device_info["image"] = device_image
     
+    def _get_professional_device_id(self) -> str:
+        """Generate a professional device identifier from MAC address."""
+        # Formatted once per address and shared with the coordinator
+        return professional_device_id(self.address)
+    
     def _get_device_image(self, device_type: str) -> str:
         """Get device image URL based on device type."""
-        # Map device types to their corresponding MDI icons
-        icon_map = {
-            "temperature_sensor": "mdi:thermometer",
-            "humidity_sensor": "mdi:water-percent", 
-            "pressure_sensor": "mdi:gauge",
-            "vibration_sensor": "mdi:vibrate",
-            "leak_sensor": "mdi:water",
-            "on_off_switch": "mdi:toggle-switch",
-            "light_switch": "mdi:lightbulb",
-            "door_switch": "mdi:door",
-            "toggle_switch": "mdi:toggle-switch",
-        }
-        
-        return icon_map.get(device_type.lower(), "mdi:chip")
+        return DEVICE_ICON_MAP.get(device_type.lower(), "mdi:chip")
             
     def _extract_sensor_value(self, data: Dict[str, Any]) -> None:
         """Extract sensor value from coordinator data."""
-        _LOGGER.info("🔍 EXTRACTING SENSOR VALUE: %s | Data: %s", self.address, data)
+        log_enabled = _LOGGER.isEnabledFor(logging.INFO)
+        if log_enabled:
+            _LOGGER.info("🔍 EXTRACTING SENSOR VALUE: %s | Data: %s", self.address, data)
         
         # Try to get sensor value from sensor_data
         sensor_data = data.get("sensor_data", {})
-        _LOGGER.info("📊 SENSOR DATA: %s | Sensor data: %s", self.address, sensor_data)
+        value_key = self._value_key
+        if log_enabled:
+            _LOGGER.info("📊 SENSOR DATA: %s | Sensor data: %s", self.address, sensor_data)
         
         # Skip leak sensors - they should be handled by binary sensor
         if "leak_detected" in sensor_data:
             # Don't process leak sensors in regular sensor
-            _LOGGER.info("💧 LEAK SENSOR SKIPPED: %s | Leak detected: %s (handled by binary sensor)", 
-                        self.address, sensor_data["leak_detected"])
-            
-        elif "temperature" in sensor_data:
-            self._attr_native_value = sensor_data["temperature"]
-            _LOGGER.info("🌡️ TEMPERATURE SENSOR: %s | Temperature: %s", 
-                        self.address, self._attr_native_value)
-            
-        elif "humidity" in sensor_data:
-            self._attr_native_value = sensor_data["humidity"]
-            _LOGGER.info("💧 HUMIDITY SENSOR: %s | Humidity: %s", 
-                        self.address, self._attr_native_value)
+            if log_enabled:
+                _LOGGER.info("💧 LEAK SENSOR SKIPPED: %s | Leak detected: %s (handled by binary sensor)", 
+                            self.address, sensor_data["leak_detected"])
             
-        elif "pressure" in sensor_data:
-            self._attr_native_value = sensor_data["pressure"]
-            _LOGGER.info("📊 PRESSURE SENSOR: %s | Pressure: %s", 
-                        self.address, self._attr_native_value)
-            
-        elif "vibration" in sensor_data:
-            self._attr_native_value = sensor_data["vibration"]
-            _LOGGER.info("📳 VIBRATION SENSOR: %s | Vibration: %s", 
-                        self.address, self._attr_native_value)
+        elif value_key is not None and (value := sensor_data.get(value_key)) is not None:
+            # Reading bound to the device type in _set_sensor_properties
+            self._attr_native_value = value
+            if log_enabled:
+                _LOGGER.info("📈 SENSOR VALUE: %s | %s: %s", 
+                            self.address, value_key, self._attr_native_value)
             
         elif "battery_level" in data and data["battery_level"] is not None:
             # Use battery level as a fallback sensor value
             self._attr_native_value = data["battery_level"]
-            _LOGGER.info("🔋 BATTERY LEVEL: %s | Battery: %s", 
-                        self.address, self._attr_native_value)
+            if log_enabled:
+                _LOGGER.info("🔋 BATTERY LEVEL: %s | Battery: %s", 
+                            self.address, self._attr_native_value)
             
         else:
             # No specific sensor value found, use RSSI as a signal strength indicator
             rssi = data.get("rssi")
             if rssi is not None:
                 # Convert RSSI to a percentage (rough approximation)
-                # RSSI typically ranges from -100 (very weak) to -30 (very strong)
-                signal_percentage = max(0, min(100, (rssi + 100) * 100 / 70))
-                self._attr_native_value = round(signal_percentage, 1)
-                _LOGGER.info("📶 RSSI SIGNAL: %s | RSSI: %s dBm | Signal: %s%%", 
-                            self.address, rssi, self._attr_native_value)
+                signal_percentage = RSSI_PERCENTAGE_MAP.get(rssi)
+                if signal_percentage is None:
+                    signal_percentage = rssi_to_percentage(rssi)
+                self._attr_native_value = signal_percentage
+                if log_enabled:
+                    _LOGGER.info("📶 RSSI SIGNAL: %s | RSSI: %s dBm | Signal: %s%%", 
+                                self.address, rssi, self._attr_native_value)
             else:
                 self._attr_native_value = None
                 _LOGGER.warning("⚠️ NO SENSOR VALUE: %s | No RSSI or sensor data found", self.address)
-
-    async def async_update(self) -> None:
-        """Update sensor state."""
-        await self.coordinator.async_request_refresh()
@@ -1,20 +1,45 @@
 """BLE switch platform for Gemns™ IoT integration."""
 
 import logging
-from typing import Any, Dict, Optional
-from datetime import datetime, timezone
+from typing import Any, Dict
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity import DeviceInfo
 
-from .const import DOMAIN, CONF_ADDRESS
-from .ble_coordinator import GemnsBluetoothProcessorCoordinator
+from .const import DOMAIN, CONF_ADDRESS, STATE_WRITE_COOLDOWN
+from .ble_coordinator import (
+    GemnsBluetoothProcessorCoordinator,
+    format_timestamp,
+    professional_device_id,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Device type -> model shown in the device registry
+DEVICE_MODEL_MAP = {
+    "leak_sensor": "Leak Sensor",
+    "button": "Button",
+    "two_way_switch": "Two Way Switch",
+    "vibration_sensor": "Vibration Sensor",
+    "on_off_switch": "On/Off Switch",
+    "light_switch": "Light Switch",
+    "door_switch": "Door Switch",
+    "toggle_switch": "Toggle Switch",
+    "unknown_device": "IoT Device",
+}
+
+# Device type -> MDI icon
+DEVICE_ICON_MAP = {
+    "on_off_switch": "mdi:toggle-switch",
+    "light_switch": "mdi:lightbulb",
+    "door_switch": "mdi:door",
+    "toggle_switch": "mdi:toggle-switch",
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -85,6 +110,12 @@ class GemnsBLESwitch(SwitchEntity):
         
         # Device type will be determined from coordinator data
         self._device_type = "unknown"
+        self._properties_key = None
+        self._device_info_key = None
+        self._last_signature = None
+        # Attributes are rebuilt only when the state signature changes instead
+        # of on every read of extra_state_attributes
+        self._attr_extra_state_attributes = self._build_extra_state_attributes()
         
     @property
     def address(self) -> str:
@@ -96,9 +127,8 @@ class GemnsBLESwitch(SwitchEntity):
         """Return if entity is available."""
         return self.coordinator.available and self._attr_available
 
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return entity specific state attributes."""
+    def _build_extra_state_attributes(self) -> Dict[str, Any]:
+        """Build entity specific state attributes from the coordinator data."""
         attrs = {
             "address": self.address,
             "device_type": self._device_type,
@@ -112,21 +142,23 @@ class GemnsBLESwitch(SwitchEntity):
         }
         
         # Add data from coordinator if available
-        if self.coordinator.data:
+        data = self.coordinator.data
+        if data:
+            available = self.coordinator.available
             attrs.update({
-                "rssi": self.coordinator.data.get("rssi"),
-                "signal_strength": self.coordinator.data.get("signal_strength"),
-                "battery_level": self.coordinator.data.get("battery_level"),
-                "last_seen": self.coordinator.data.get("timestamp"),
+                "rssi": data.get("rssi"),
+                "signal_strength": data.get("rssi"),
+                "battery_level": data.get("battery_level"),
+                "last_seen": format_timestamp(data.get("timestamp")),
                 "ble_active": True,  # If we have data, BLE is active
-                "ble_connected": self.coordinator.available,  # Use coordinator availability
-                "ble_status": "active" if self.coordinator.available else "inactive",
-                "last_update_success": getattr(self.coordinator, 'last_update_success', True),
+                "ble_connected": available,  # Use coordinator availability
+                "ble_status": "active" if available else "inactive",
+                "last_update_success": self.coordinator.last_update_success,
             })
             
             # Add sensor-specific attributes
-            if "sensor_data" in self.coordinator.data:
-                sensor_data = self.coordinator.data["sensor_data"]
+            sensor_data = data.get("sensor_data")
+            if sensor_data:
                 if "switch_on" in sensor_data:
                     attrs["switch_on"] = sensor_data["switch_on"]
                 if "event_counter" in sensor_data:
@@ -138,7 +170,23 @@ class GemnsBLESwitch(SwitchEntity):
 
     async def async_added_to_hass(self) -> None:
         """Call when entity is added to hass."""
+        # Prime state from data the coordinator already has, so the initial
+        # state write carries it and an identical first callback is skipped
+        if self.coordinator.data:
+            self._update_from_coordinator()
+            self._last_signature = self._state_signature()
+            self._attr_extra_state_attributes = self._build_extra_state_attributes()
         await super().async_added_to_hass()
+        # Attribute-only changes (RSSI, last seen, counters) are coalesced into
+        # one trailing state write per cooldown
+        self._attributes_debouncer = Debouncer(
+            self.hass,
+            _LOGGER,
+            cooldown=STATE_WRITE_COOLDOWN,
+            immediate=True,
+            function=self.async_write_ha_state,
+        )
+        self.async_on_remove(self._attributes_debouncer.async_cancel)
         # Register with coordinator to receive updates
         self._unsub_coordinator = self.coordinator.async_add_listener(self._handle_coordinator_update)
         # Set up cleanup when entity is removed
@@ -157,23 +205,55 @@ class GemnsBLESwitch(SwitchEntity):
                 _LOGGER.info("🔄 SWITCH STATE CHANGED: %s | Previous: %s | New: %s", 
                            self.address, previous_state, self._attr_is_on)
             
-            self.async_write_ha_state()
+            # Skip the state write when nothing shown in the state or its
+            # attributes changed since the last one
+            signature = self._state_signature()
+            last_signature = self._last_signature
+            if signature == last_signature:
+                return
+            self._last_signature = signature
+            self._attr_extra_state_attributes = self._build_extra_state_attributes()
+            
+            # State, availability and device type changes are written at once so
+            # no transition is lost; the write also carries pending attributes
+            if last_signature is None or signature[:4] != last_signature[:4]:
+                self._attributes_debouncer.async_cancel()
+                self.async_write_ha_state()
+            else:
+                self._attributes_debouncer.async_schedule_call()
         except Exception as e:
             _LOGGER.error("Error handling coordinator update for %s: %s", self.address, e)
 
+    def _state_signature(self) -> tuple:
+        """Return the values the entity state and attributes are built from."""
+        data = self.coordinator.data or {}
+        return (
+            self._attr_is_on,
+            self._attr_available,
+            self._device_type,
+            self.coordinator.last_update_success,
+            data.get("rssi"),
+            data.get("battery_level"),
+            data.get("timestamp"),
+            data.get("sensor_data"),
+        )
+
     def _update_from_coordinator(self) -> None:
         """Update switch state from coordinator data."""
-        if not self.coordinator.data:
+        log_enabled = _LOGGER.isEnabledFor(logging.INFO)
+        data = self.coordinator.data
+        if not data:
             self._attr_available = False
             _LOGGER.debug("BLE switch %s: No coordinator data", self.address)
             return
             
-        data = self.coordinator.data
-        _LOGGER.info("🔄 UPDATING SWITCH: %s | Coordinator data: %s", self.address, data)
+        if log_enabled:
+            _LOGGER.info("🔄 UPDATING SWITCH: %s | Coordinator data: %s", self.address, data)
         
         # Update device type
         self._device_type = data.get("device_type", "unknown")
-        _LOGGER.info("🏷️ DEVICE TYPE: %s | Type: %s", self.address, self._device_type)
+        if log_enabled:
+            _LOGGER.info("🏷️ DEVICE TYPE: %s | Type: %s", self.address, self._device_type)
         
         # Set switch properties based on device type
         self._set_switch_properties()
@@ -186,15 +266,20 @@ class GemnsBLESwitch(SwitchEntity):
         
         # Update availability
         self._attr_available = True
-        _LOGGER.info("✅ SWITCH UPDATED: %s | Available: %s | Value: %s | BLE_active: %s | Coordinator_available: %s", 
-                     self.address, self._attr_available, self._attr_is_on, True, self.coordinator.available)
+        if log_enabled:
+            _LOGGER.info("✅ SWITCH UPDATED: %s | Available: %s | Value: %s | BLE_active: %s | Coordinator_available: %s", 
+                         self.address, self._attr_available, self._attr_is_on, True, self.coordinator.available)
         
     def _set_switch_properties(self) -> None:
         """Set switch properties based on device type."""
         device_type = self._device_type.lower()
-        
-        # Get short address for display
-        short_address = self.address.replace(":", "")[-6:].upper()
+
+        # Name, icon and classes depend only on the device type and address,
+        # so the formatted name is only rebuilt when one of them changes
+        properties_key = (device_type, self.address)
+        if properties_key == self._properties_key:
+            return
+        self._properties_key = properties_key
         
         # Set properties based on device type
         if "light" in device_type:
@@ -221,21 +306,13 @@ class GemnsBLESwitch(SwitchEntity):
         """Update device info with proper name and model."""
         device_type = self._device_type.lower()
         
-        # Set model based on device type
-        model_map = {
-            "leak_sensor": "Leak Sensor",
-            "button": "Button",
-            "vibration_sensor": "Vibration Monitor",
-            "two_way_switch": "Two Way Switch",
-            "vibration_sensor": "Vibration Sensor",
-            "on_off_switch": "On/Off Switch",
-            "light_switch": "Light Switch",
-            "door_switch": "Door Switch",
-            "toggle_switch": "Toggle Switch",
-            "unknown_device": "IoT Device"
-        }
+        # Keep the existing DeviceInfo unless something it is built from changed
+        device_info_key = (device_type, self.address, self._attr_name)
+        if device_info_key == self._device_info_key:
+            return
+        self._device_info_key = device_info_key
         
-        model = model_map.get(device_type, "IoT Switch")
+        model = DEVICE_MODEL_MAP.get(device_type, "IoT Switch")
         
         # Set device image based on device type
         device_image = self._get_device_image(device_type)
@@ -255,45 +332,37 @@ class GemnsBLESwitch(SwitchEntity):
 
     def _get_professional_device_id(self) -> str:
         """Generate a professional device identifier from MAC address."""
-        # Remove colons and get last 6 characters
-        clean_address = self.address.replace(":", "").upper()
-        last_6 = clean_address[-6:]
-        
-        # Convert to a more professional format
-        device_number = int(last_6, 16) % 1000  # Get a number between 0-999
-        return f"Unit-{device_number:03d}"
+        # Formatted once per address and shared with the coordinator
+        return professional_device_id(self.address)
     
     def _get_device_image(self, device_type: str) -> str:
         """Get device image URL based on device type."""
-        # Map device types to their corresponding MDI icons
-        icon_map = {
-            "on_off_switch": "mdi:toggle-switch",
-            "light_switch": "mdi:lightbulb",
-            "door_switch": "mdi:door",
-            "toggle_switch": "mdi:toggle-switch",
-        }
-        
-        return icon_map.get(device_type.lower(), "mdi:toggle-switch")
+        return DEVICE_ICON_MAP.get(device_type.lower(), "mdi:toggle-switch")
             
     def _extract_switch_value(self, data: Dict[str, Any]) -> None:
         """Extract switch value from coordinator data."""
-        _LOGGER.info("🔍 EXTRACTING SWITCH VALUE: %s | Data: %s", self.address, data)
+        log_enabled = _LOGGER.isEnabledFor(logging.INFO)
+        if log_enabled:
+            _LOGGER.info("🔍 EXTRACTING SWITCH VALUE: %s | Data: %s", self.address, data)
         
         # Try to get switch value from sensor_data
         sensor_data = data.get("sensor_data", {})
-        _LOGGER.info("📊 SENSOR DATA: %s | Sensor data: %s", self.address, sensor_data)
+        if log_enabled:
+            _LOGGER.info("📊 SENSOR DATA: %s | Sensor data: %s", self.address, sensor_data)
         
         if "switch_on" in sensor_data:
             # For switches, return True if switch is on
             self._attr_is_on = sensor_data["switch_on"]
-            _LOGGER.info("🔌 SWITCH VALUE: %s | Switch on: %s | Value: %s", 
-                        self.address, sensor_data["switch_on"], self._attr_is_on)
+            if log_enabled:
+                _LOGGER.info("🔌 SWITCH VALUE: %s | Switch on: %s | Value: %s", 
+                            self.address, sensor_data["switch_on"], self._attr_is_on)
             
         elif "sensor_event" in sensor_data:
             # For other devices, use sensor_event as switch state
             self._attr_is_on = sensor_data["sensor_event"] > 0
-            _LOGGER.info("📡 SENSOR EVENT SWITCH: %s | Event: %s | Value: %s", 
-                        self.address, sensor_data["sensor_event"], self._attr_is_on)
+            if log_enabled:
+                _LOGGER.info("📡 SENSOR EVENT SWITCH: %s | Event: %s | Value: %s", 
+                            self.address, sensor_data["sensor_event"], self._attr_is_on)
             
         else:
             # No specific switch value found, default to False
@@ -315,7 +384,3 @@ class GemnsBLESwitch(SwitchEntity):
         # The switch state is determined by the device's sensor_event data
         _LOGGER.warning("Switch control is read-only. State is determined by device sensor_event data.")
         self.async_write_ha_state()
-
-    async def async_update(self) -> None:
-        """Update switch state."""
-        await self.coordinator.async_request_refresh()
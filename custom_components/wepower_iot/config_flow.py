@@ -24,10 +24,54 @@ from .const import (
     CONF_DECRYPTION_KEY,
     CONF_DEVICE_NAME,
     CONF_DEVICE_TYPE,
+    DEVICE_TYPE_CHOICES,
+    SENSOR_TYPE_LEAK,
+    DECRYPTION_KEY_RE,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# URL schemes accepted for the MQTT broker
+MQTT_BROKER_SCHEMES = ("mqtt://", "mqtts://")
+
+STEP_USER_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required("integration_type"): vol.In({
+            "mqtt": "MQTT-based (Traditional)",
+            "ble": "Bluetooth Low Energy (BLE) - Manual Provisioning"
+        }),
+    }
+)
+
+STEP_MQTT_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(
+            CONF_MQTT_BROKER, default=DEFAULT_MQTT_BROKER
+        ): str,
+        vol.Optional(CONF_MQTT_USERNAME): str,
+        vol.Optional(CONF_MQTT_PASSWORD): str,
+        vol.Required(
+            CONF_ENABLE_ZIGBEE, default=DEFAULT_ENABLE_ZIGBEE
+        ): bool,
+        vol.Required(
+            CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL
+        ): vol.Coerce(float),
+        vol.Required(
+            CONF_HEARTBEAT_INTERVAL, default=DEFAULT_HEARTBEAT_INTERVAL
+        ): vol.Coerce(float),
+    }
+)
+
+STEP_BLE_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_DECRYPTION_KEY): str,
+        vol.Optional(CONF_DEVICE_NAME): str,
+        vol.Optional(CONF_DEVICE_TYPE, default=SENSOR_TYPE_LEAK): vol.All(
+            vol.Coerce(int), vol.In(DEVICE_TYPE_CHOICES)
+        ),
+    }
+)
+
 
 class GemnsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Gemns™ IoT."""
@@ -45,14 +89,7 @@ class GemnsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is None:
             return self.async_show_form(
                 step_id="user",
-                data_schema=vol.Schema(
-                    {
-                        vol.Required("integration_type"): vol.In({
-                            "mqtt": "MQTT-based (Traditional)",
-                            "ble": "Bluetooth Low Energy (BLE) - Manual Provisioning"
-                        }),
-                    }
-                ),
+                data_schema=STEP_USER_DATA_SCHEMA,
             )
 
         integration_type = user_input["integration_type"]
@@ -71,48 +108,16 @@ class GemnsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is None:
             return self.async_show_form(
                 step_id="mqtt",
-                data_schema=vol.Schema(
-                    {
-                        vol.Required(
-                            CONF_MQTT_BROKER, default=DEFAULT_MQTT_BROKER
-                        ): str,
-                        vol.Optional(CONF_MQTT_USERNAME): str,
-                        vol.Optional(CONF_MQTT_PASSWORD): str,
-                        vol.Required(
-                            CONF_ENABLE_ZIGBEE, default=DEFAULT_ENABLE_ZIGBEE
-                        ): bool,
-                        vol.Required(
-                            CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL
-                        ): vol.Coerce(float),
-                        vol.Required(
-                            CONF_HEARTBEAT_INTERVAL, default=DEFAULT_HEARTBEAT_INTERVAL
-                        ): vol.Coerce(float),
-                    }
-                ),
+                data_schema=STEP_MQTT_DATA_SCHEMA,
             )
 
         # Validate MQTT broker URL
         mqtt_broker = user_input[CONF_MQTT_BROKER]
-        if not mqtt_broker.startswith(("mqtt://", "mqtts://")):
+        if not mqtt_broker.startswith(MQTT_BROKER_SCHEMES):
             return self.async_show_form(
                 step_id="mqtt",
-                data_schema=vol.Schema(
-                    {
-                        vol.Required(
-                            CONF_MQTT_BROKER, default=mqtt_broker
-                        ): str,
-                        vol.Optional(CONF_MQTT_USERNAME): str,
-                        vol.Optional(CONF_MQTT_PASSWORD): str,
-                        vol.Required(
-                            CONF_ENABLE_ZIGBEE, default=user_input[CONF_ENABLE_ZIGBEE]
-                        ): bool,
-                        vol.Required(
-                            CONF_SCAN_INTERVAL, default=user_input[CONF_SCAN_INTERVAL]
-                        ): vol.Coerce(float),
-                        vol.Required(
-                            CONF_HEARTBEAT_INTERVAL, default=user_input[CONF_HEARTBEAT_INTERVAL]
-                        ): vol.Coerce(float),
-                    }
+                data_schema=self.add_suggested_values_to_schema(
+                    STEP_MQTT_DATA_SCHEMA, user_input
                 ),
                 errors={"base": "invalid_mqtt_broker"},
             )
@@ -135,40 +140,20 @@ class GemnsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             decryption_key = user_input[CONF_DECRYPTION_KEY]
             device_name = user_input.get(CONF_DEVICE_NAME, "Gemns™ IoT Device")
-            device_type = int(user_input.get(CONF_DEVICE_TYPE, "4"))
+            device_type = user_input.get(CONF_DEVICE_TYPE, SENSOR_TYPE_LEAK)
             
-            # Validate decryption key format
-            try:
-                bytes.fromhex(decryption_key)
-                if len(decryption_key) != 32:  # 16 bytes = 32 hex chars
-                    return self.async_show_form(
-                        step_id="ble",
-                        data_schema=vol.Schema({
-                            vol.Required(CONF_DECRYPTION_KEY, default=decryption_key): str,
-                            vol.Optional(CONF_DEVICE_NAME, default=device_name): str,
-                            vol.Optional(CONF_DEVICE_TYPE, default="4"): vol.In({
-                                "1": "Button",
-                                "2": "Vibration Monitor", 
-                                "3": "Two Way Switch",
-                                "4": "Leak Sensor"
-                            }),
-                        }),
-                        errors={"base": "invalid_decryption_key_length"},
-                    )
-            except ValueError:
+            # Validate decryption key format (16 bytes = 32 hex chars)
+            if not DECRYPTION_KEY_RE.match(decryption_key):
                 return self.async_show_form(
                     step_id="ble",
-                    data_schema=vol.Schema({
-                        vol.Required(CONF_DECRYPTION_KEY, default=decryption_key): str,
-                        vol.Optional(CONF_DEVICE_NAME, default=device_name): str,
-                        vol.Optional(CONF_DEVICE_TYPE, default="4"): vol.In({
-                            "1": "Button",
-                            "2": "Vibration Monitor", 
-                            "3": "Two Way Switch",
-                            "4": "Leak Sensor"
-                        }),
-                    }),
-                    errors={"base": "invalid_decryption_key_format"},
+                    data_schema=self.add_suggested_values_to_schema(
+                        STEP_BLE_DATA_SCHEMA, user_input
+                    ),
+                    errors={
+                        "base": "invalid_decryption_key_length"
+                        if len(decryption_key) != 32
+                        else "invalid_decryption_key_format"
+                    },
                 )
             
             # Generate a unique ID for this config entry
@@ -195,16 +180,7 @@ class GemnsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="ble",
-            data_schema=vol.Schema({
-                vol.Required(CONF_DECRYPTION_KEY): str,
-                vol.Optional(CONF_DEVICE_NAME): str,
-                vol.Optional(CONF_DEVICE_TYPE, default="4"): vol.In({
-                    "1": "Button",
-                    "2": "Vibration Monitor", 
-                    "3": "Two Way Switch",
-                    "4": "Leak Sensor"
-                }),
-            }),
+            data_schema=STEP_BLE_DATA_SCHEMA,
             description_placeholders={
                 "message": "Gemns™ IoT BLE Setup\n\nEnter your decryption key to complete setup.\n\nThe MAC address will be automatically detected when your Gemns™ IoT device is discovered.\n\nDevice Types:\n• Type 1: Button\n• Type 2: Vibration Monitor\n• Type 3: Two Way Switch\n• Type 4: Leak Sensor\n\nDecryption Key: 32-character hex string (16 bytes)",
                 "integration_icon": "https://brands.home-assistant.io/_/gemns/icon.png"
@@ -212,29 +188,57 @@ class GemnsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
-    async def async_step_import(self, import_info: dict[str, Any]) -> FlowResult:
-        """Handle import from configuration.yaml."""
-        return await self.async_step_user(import_info)
-
-    async def async_step_add_device(
+    async def async_step_reconfigure(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle adding a new device."""
-        if user_input is None:
-            return self.async_show_form(
-                step_id="add_device",
-                data_schema=vol.Schema(
-                    {
-                        vol.Required("device_id"): str,
-                        vol.Required("device_type"): vol.In(["ble", "zigbee"]),
-                        vol.Required("device_category"): vol.In(["sensor", "switch", "light", "door", "toggle"]),
-                        vol.Required("ble_discovery_mode"): vol.In(["v0_manual", "v1_auto"]),
-                        vol.Optional("device_name"): str,
-                        vol.Optional("network_key"): str,
-                    }
-                ),
-            )
+        """Reconfigure an existing entry in place, without rediscovery."""
+        if hasattr(self, "_get_reconfigure_entry"):
+            entry = self._get_reconfigure_entry()
+        else:
+            # Home Assistant releases before the reconfigure entry helper
+            entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
+        
+        # BLE entries carry a decryption key, MQTT entries a broker
+        is_ble = CONF_DECRYPTION_KEY in entry.data
+        schema = STEP_BLE_DATA_SCHEMA if is_ble else STEP_MQTT_DATA_SCHEMA
+        
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if is_ble:
+                decryption_key = user_input[CONF_DECRYPTION_KEY]
+                # Validate decryption key format (16 bytes = 32 hex chars)
+                if not DECRYPTION_KEY_RE.match(decryption_key):
+                    errors["base"] = (
+                        "invalid_decryption_key_length"
+                        if len(decryption_key) != 32
+                        else "invalid_decryption_key_format"
+                    )
+            elif not user_input[CONF_MQTT_BROKER].startswith(MQTT_BROKER_SCHEMES):
+                errors["base"] = "invalid_mqtt_broker"
+            
+            if not errors:
+                # Fields left empty are missing from user_input, so drop
+                # every key the form owns first or cleared values survive
+                data = {
+                    key: value
+                    for key, value in entry.data.items()
+                    if key not in schema.schema
+                }
+                return self.async_update_reload_and_abort(
+                    entry,
+                    data=data | user_input,
+                    # Older releases default to reauth_successful
+                    reason="reconfigure_successful",
+                )
+        
+        return self.async_show_form(
+            step_id="reconfigure",
+            data_schema=self.add_suggested_values_to_schema(
+                schema, user_input if user_input is not None else entry.data
+            ),
+            errors=errors,
+        )
 
-        # Add device logic would go here
-        # For now, just return to main flow
-        return self.async_abort(reason="device_added")
+    async def async_step_import(self, import_info: dict[str, Any]) -> FlowResult:
+        """Handle import from configuration.yaml."""
+        return await self.async_step_user(import_info)
@@ -1,4 +1,5 @@
 """Constants for the Gemns™ IoT integration."""
+import re
 from typing import Final
 
 DOMAIN: Final = "gemns"
@@ -58,6 +59,16 @@ BLE_COMPANY_ID: Final = 0x5750  # Gemns™ IoT company ID
 BLE_PACKET_LENGTH: Final = 20
 BLE_ENCRYPTED_DATA_SIZE: Final = 16
 
+# Substrings identifying Gemns™ IoT devices by advertised name; compiled once
+# into a case-insensitive regex (BLE_NAME_RE) by the BLE coordinator
+BLE_NAME_PATTERNS: Final = ("GEMNS", "GEMS")
+
+# str.translate table stripping ":" separators from MAC addresses
+MAC_SEPARATOR_TABLE: Final = str.maketrans("", "", ":")
+
+# Seconds over which attribute-only BLE entity state writes are coalesced
+STATE_WRITE_COOLDOWN: Final = 0.25
+
 # BLE Configuration
 CONF_ADDRESS: Final = "address"
 CONF_NAME: Final = "name"
@@ -65,6 +76,11 @@ CONF_DECRYPTION_KEY: Final = "decryption_key"
 CONF_DEVICE_NAME: Final = "device_name"
 CONF_DEVICE_TYPE: Final = "device_type"
 
+# Decryption key must be exactly 16 bytes written as 32 hex characters;
+# the flow steps match this compiled pattern themselves, so the voluptuous
+# schemas only describe the forms and pick the error to show
+DECRYPTION_KEY_RE: Final = re.compile(r"\A[0-9a-fA-F]{32}\Z")
+
 # Sensor Types
 SENSOR_TYPE_LEAK: Final = 4
 SENSOR_TYPE_TEMPERATURE: Final = 1
@@ -72,6 +88,15 @@ SENSOR_TYPE_HUMIDITY: Final = 2
 SENSOR_TYPE_PRESSURE: Final = 3
 SENSOR_TYPE_VIBRATION: Final = 5
 
+# Sensor type choices offered for manual BLE provisioning; keys are the
+# coerced int the flows store under CONF_DEVICE_TYPE
+DEVICE_TYPE_CHOICES: Final = {
+    1: "Button",
+    2: "Vibration Monitor",
+    3: "Two Way Switch",
+    SENSOR_TYPE_LEAK: "Leak Sensor",
+}
+
 # Switch Types
 SWITCH_TYPE_ON_OFF: Final = 6
 SWITCH_TYPE_LIGHT: Final = 7
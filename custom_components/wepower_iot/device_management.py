@@ -1,7 +1,7 @@
 """Device management for Gemns™ IoT integration."""
 
 import asyncio
-import json
+from collections import defaultdict
 import logging
 from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone
@@ -11,6 +11,7 @@ from homeassistant.const import CONF_DEVICE_ID, CONF_NAME
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.util.json import json_loads
 from homeassistant.components import mqtt
 from homeassistant.components.mqtt import async_publish, async_subscribe
 
@@ -45,6 +46,10 @@ class GemnsDeviceManager:
         self.hass = hass
         self.config = config
         self.devices: Dict[str, Dict[str, Any]] = {}
+        # Device IDs by category and by device type, kept in step with
+        # self.devices by add_device, remove_device and the MQTT handler
+        self._devices_by_category: Dict[str, set] = defaultdict(set)
+        self._devices_by_type: Dict[str, set] = defaultdict(set)
         self.entity_registry = er.async_get(hass)
         self._subscribers = {}
         self._mqtt_client = None
@@ -84,7 +89,7 @@ class GemnsDeviceManager:
                 "properties": {}
             }
             
-            self.devices[device_id] = device
+            self._store_device(device_id, device)
             
             # Notify subscribers - this is called from async context, so it's safe
             self.hass.async_create_task(
@@ -98,6 +103,28 @@ class GemnsDeviceManager:
             _LOGGER.error(f"Error adding device: {e}")
             return False
             
+    def remove_device(self, device_id: str) -> bool:
+        """Remove a device by ID."""
+        device = self.devices.pop(device_id, None)
+        if device is None:
+            return False
+        self._unindex_device(device_id, device)
+        return True
+        
+    def _store_device(self, device_id: str, device: Dict[str, Any]) -> None:
+        """Store a device, replacing any previous entry, and index it."""
+        previous = self.devices.get(device_id)
+        if previous is not None:
+            self._unindex_device(device_id, previous)
+        self.devices[device_id] = device
+        self._devices_by_category[device.get("category")].add(device_id)
+        self._devices_by_type[device.get("device_type")].add(device_id)
+        
+    def _unindex_device(self, device_id: str, device: Dict[str, Any]) -> None:
+        """Remove a device from the category and type indexes."""
+        self._devices_by_category[device.get("category")].discard(device_id)
+        self._devices_by_type[device.get("device_type")].discard(device_id)
+        
     def get_device(self, device_id: str) -> Optional[Dict[str, Any]]:
         """Get a device by ID."""
         return self.devices.get(device_id)
@@ -108,14 +135,17 @@ class GemnsDeviceManager:
         
     def get_devices_by_category(self, category: str) -> List[Dict[str, Any]]:
         """Get devices by category."""
-        return [d for d in self.devices.values() if d.get("category") == category]
+        devices = self.devices
+        return [devices[device_id] for device_id in self._devices_by_category.get(category, ())]
         
     def get_devices_by_type(self, device_type: str) -> List[Dict[str, Any]]:
         """Get devices by type."""
-        return [d for d in self.devices.values() if d.get("device_type") == device_type]
+        devices = self.devices
+        return [devices[device_id] for device_id in self._devices_by_type.get(device_type, ())]
         
     def get_devices_by_status(self, status: str) -> List[Dict[str, Any]]:
         """Get devices by status."""
+        # Not indexed: entities update a device's status in place
         return [d for d in self.devices.values() if d.get("status") == status]
         
     async def _subscribe_to_mqtt(self):
@@ -149,7 +179,7 @@ class GemnsDeviceManager:
     def _handle_status_message(self, msg):
         """Handle status messages from add-on."""
         try:
-            data = json.loads(msg.payload)
+            data = json_loads(msg.payload)
             _LOGGER.info(f"Status message received: {data}")
         except Exception as e:
             _LOGGER.error(f"Error handling status message: {e}")
@@ -157,7 +187,7 @@ class GemnsDeviceManager:
     def _handle_device_message(self, msg):
         """Handle device messages."""
         try:
-            data = json.loads(msg.payload)
+            data = json_loads(msg.payload)
             _LOGGER.info(f"Device message received: {data}")
             
             # Update device status
@@ -172,7 +202,7 @@ class GemnsDeviceManager:
                 if "properties" not in data:
                     data["properties"] = {}
                     
-                self.devices[device_id] = data
+                self._store_device(device_id, data)
                 _LOGGER.info(f"Updated device {device_id} with status: {data.get('status')}")
                 
                 # Schedule the dispatcher call in the main event loop
@@ -188,7 +218,7 @@ class GemnsDeviceManager:
     def _handle_control_message(self, msg):
         """Handle control messages from add-on."""
         try:
-            data = json.loads(msg.payload)
+            data = json_loads(msg.payload)
             _LOGGER.info(f"Control message received: {data}")
             
             # Handle different control actions
@@ -1,6 +1,7 @@
 """Packet parser for Gemns™ IoT BLE devices with new packet format."""
 
 import struct
+from functools import lru_cache
 from typing import Any, Dict, Optional
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
@@ -13,9 +14,52 @@ COMPANY_ID = 0x5750  # Gemns™ IoT company ID
 PACKET_LENGTH = 18  # Total packet length (HA BLE driver filters company ID)
 ENCRYPTED_DATA_SIZE = 16
 
+# Precompiled little-endian decoders (unpack_from avoids slicing the packet)
+UINT16_LE = struct.Struct('<H')
+UINT32_LE = struct.Struct('<I')
+
+# Flags (1) + Encrypted Data (16) + CRC (1), unpacked in a single call
+PACKET_STRUCT = struct.Struct('<B16sB')
+
+# Company ID as it appears on air, prepended back for CRC calculation
+COMPANY_ID_BYTES = UINT16_LE.pack(COMPANY_ID)
+
+def _build_crc8_table(polynomial: int) -> tuple[int, ...]:
+    """Build the 256-entry lookup table for a non-reflected CRC-8."""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ polynomial) if crc & 0x80 else (crc << 1)
+            crc &= 0xFF
+        table.append(crc)
+    return tuple(table)
+
+# CRC-8 with polynomial 0x07 (matches the device firmware)
+CRC8_TABLE = _build_crc8_table(0x07)
+
+# Device type -> (sensor_data flag, event type that sets it), matching device_type_t
+SENSOR_EVENT_FLAGS: dict[int, tuple[str, int]] = {
+    0: ('button_pressed', 0),  # DEVICE_TYPE_LEGACY, EVENT_TYPE_BUTTON_PRESS = 0
+    1: ('button_pressed', 0),  # DEVICE_TYPE_BUTTON, EVENT_TYPE_BUTTON_PRESS = 0
+    2: ('vibration_detected', 1),  # DEVICE_TYPE_VIBRATION_MONITOR, EVENT_TYPE_VIBRATION = 1
+    3: ('switch_on', 3),  # DEVICE_TYPE_TWO_WAY_SWITCH, EVENT_TYPE_BUTTON_ON = 3
+    4: ('leak_detected', 4),  # DEVICE_TYPE_LEAK_SENSOR, EVENT_TYPE_LEAK_DETECTED = 4
+}
+
+# CRC-8 state after the company ID prefix, so validation can continue from it
+COMPANY_ID_CRC8 = CRC8_TABLE[CRC8_TABLE[COMPANY_ID_BYTES[0]] ^ COMPANY_ID_BYTES[1]]
+
+@lru_cache(maxsize=8)
+def _aes_ecb_cipher(decryption_key: bytes) -> Cipher:
+    """Return the AES-ECB cipher for a key, built once per key."""
+    return Cipher(algorithms.AES(decryption_key), modes.ECB(), backend=default_backend())
+
 class GemnsPacketFlags:
     """Flags field parser for Gemns™ IoT packets."""
     
+    __slots__ = ('encrypt_status', 'self_external_power', 'event_counter_lsb', 'payload_length')
+    
     def __init__(self, flags_byte: int):
         self.encrypt_status = flags_byte & 0x01
         self.self_external_power = (flags_byte >> 1) & 0x01
@@ -25,6 +69,8 @@ class GemnsPacketFlags:
 class GemnsEncryptedData:
     """Encrypted data structure for Gemns™ IoT packets."""
     
+    __slots__ = ('data_bytes', 'src_id', 'nwk_id', 'fw_version', 'device_type', 'payload')
+    
     def __init__(self, data: bytes):
         if len(data) != ENCRYPTED_DATA_SIZE:
             raise ValueError(f"Encrypted data must be {ENCRYPTED_DATA_SIZE} bytes")
@@ -40,18 +86,20 @@ class GemnsEncryptedData:
         self.device_type = data[6:8]  # 2 bytes - Device type
         self.payload = data[8:16]  # 8 bytes - Custom payload
         
-        _LOGGER.info("🔍 ENCRYPTED DATA PARSING:")
-        _LOGGER.info("  Raw data: %s", data.hex())
-        _LOGGER.info("  Raw data bytes: %s", [hex(b) for b in data])
-        _LOGGER.info("  SRC ID (bytes 0-2): %s", self.src_id.hex())
-        _LOGGER.info("  NWK ID (bytes 3-4): %s", self.nwk_id.hex())
-        _LOGGER.info("  FW Version (byte 5): %d (0x%02X)", self.fw_version, self.fw_version)
-        _LOGGER.info("  Device Type (bytes 6-7): %s", self.device_type.hex())
-        _LOGGER.info("  Payload (bytes 8-15): %s", self.payload.hex())
+        if _LOGGER.isEnabledFor(logging.INFO):
+            _LOGGER.info("🔍 ENCRYPTED DATA PARSING:")
+            _LOGGER.info("  Raw data: %s", data.hex())
+            _LOGGER.info("  SRC ID (bytes 0-2): %s", self.src_id.hex())
+            _LOGGER.info("  NWK ID (bytes 3-4): %s", self.nwk_id.hex())
+            _LOGGER.info("  FW Version (byte 5): %d (0x%02X)", self.fw_version, self.fw_version)
+            _LOGGER.info("  Device Type (bytes 6-7): %s", self.device_type.hex())
+            _LOGGER.info("  Payload (bytes 8-15): %s", self.payload.hex())
 
 class GemnsPacket:
     """Parser for Gemns™ IoT BLE packets."""
     
+    __slots__ = ('raw_data', 'company_id', 'flags', 'encrypted_data', 'crc')
+    
     def __init__(self, raw_data: bytes):
         """Initialize packet parser with 18-byte packet (HA BLE driver filters company ID)."""
         if len(raw_data) < PACKET_LENGTH:
@@ -61,12 +109,13 @@ class GemnsPacket:
         # Packet structure after HA BLE driver filters company ID:
         # Flags (1 byte) + Encrypted Data (16 bytes) + CRC (1 byte) = 18 bytes
         self.company_id = COMPANY_ID  # Gemns™ IoT company ID (filtered by HA)
-        self.flags = GemnsPacketFlags(raw_data[0])  # 1 byte flags
-        self.encrypted_data = GemnsEncryptedData(raw_data[1:17])  # 16 bytes encrypted data
-        self.crc = raw_data[17]  # 1 byte CRC (position 17, not 16!)
+        flags_byte, encrypted_bytes, crc = PACKET_STRUCT.unpack_from(raw_data)
+        self.flags = GemnsPacketFlags(flags_byte)  # 1 byte flags
+        self.encrypted_data = GemnsEncryptedData(encrypted_bytes)  # 16 bytes encrypted data
+        self.crc = crc  # 1 byte CRC (position 17, not 16!)
         
         _LOGGER.info("🔍 PACKET STRUCTURE: Length=%d, Flags=0x%02X, CRC=0x%02X", 
-                    len(raw_data), raw_data[0], self.crc)
+                    len(raw_data), flags_byte, crc)
     
     def is_valid_company_id(self) -> bool:
         """Check if this is a Gemns™ IoT packet."""
@@ -79,38 +128,31 @@ class GemnsPacket:
         # We have: Flags (1) + Encrypted Data (16) + CRC (1) = 18 bytes
         # Need to add Company ID back for CRC calculation
         
-        company_id_bytes = struct.pack('<H', COMPANY_ID)  # 0x5750 as little-endian bytes
-        full_packet = company_id_bytes + self.raw_data  # Add company ID back
+        company_id_bytes = COMPANY_ID_BYTES  # 0x5750 as little-endian bytes
         
-        # Calculate CRC over all data except the last byte (CRC field)
-        data_to_check = full_packet[:-1]
-        calculated_crc = self._calculate_crc8(data_to_check)
+        # Calculate CRC over all data except the last byte (CRC field), continuing
+        # from the company ID's CRC instead of concatenating it back on
+        data_to_check = memoryview(self.raw_data)[:-1]
+        calculated_crc = self._calculate_crc8(data_to_check, COMPANY_ID_CRC8)
         
-        _LOGGER.info("🔍 CRC VALIDATION:")
-        _LOGGER.info("  Company ID bytes: %s", company_id_bytes.hex())
-        _LOGGER.info("  Raw data: %s", self.raw_data.hex())
-        _LOGGER.info("  Full packet: %s", full_packet.hex())
-        _LOGGER.info("  Data to check: %s", data_to_check.hex())
-        _LOGGER.info("  Calculated CRC: 0x%02X", calculated_crc)
-        _LOGGER.info("  Expected CRC: 0x%02X", self.crc)
-        _LOGGER.info("  Match: %s", calculated_crc == self.crc)
+        if _LOGGER.isEnabledFor(logging.INFO):
+            _LOGGER.info("🔍 CRC VALIDATION:")
+            _LOGGER.info("  Data to check: %s%s", company_id_bytes.hex(), data_to_check.hex())
+            _LOGGER.info("  Calculated CRC: 0x%02X", calculated_crc)
+            _LOGGER.info("  Expected CRC: 0x%02X", self.crc)
+            _LOGGER.info("  Match: %s", calculated_crc == self.crc)
         
         return calculated_crc == self.crc
     
-    def _calculate_crc8(self, data: bytes) -> int:
+    def _calculate_crc8(self, data: bytes | memoryview, crc: int = 0x00) -> int:
         """Calculate CRC8 checksum using the same algorithm as the C code."""
         # CRC-8 with polynomial 0x07, initial value 0x00, no reflection
         # This matches the C implementation: crc8(data, len, 0x07, 0x00, false)
-        crc = 0x00  # Initial value
+        # A non-zero crc continues a calculation over a preceding prefix
+        table = CRC8_TABLE
         
         for byte in data:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x80:
-                    crc = (crc << 1) ^ 0x07
-                else:
-                    crc <<= 1
-                crc &= 0xFF
+            crc = table[crc ^ byte]
         
         return crc
     
@@ -124,25 +166,20 @@ class GemnsPacket:
                 decrypted_data = self.encrypted_data.data_bytes
             else:
                 # Data is encrypted (encrypt_status == 0), decrypt it
-                cipher = Cipher(
-                    algorithms.AES(decryption_key),
-                    modes.ECB(),
-                    backend=default_backend()
-                )
-                decryptor = cipher.decryptor()
+                decryptor = _aes_ecb_cipher(decryption_key).decryptor()
                 decrypted_data = decryptor.update(self.encrypted_data.data_bytes) + decryptor.finalize()
             
             # Parse decrypted data
             decrypted_packet = GemnsEncryptedData(decrypted_data)
             
-            _LOGGER.info("🔍 DECRYPTED DATA ANALYSIS:")
-            _LOGGER.info("  Decrypted data length: %d", len(decrypted_data))
-            _LOGGER.info("  Decrypted data hex: %s", decrypted_data.hex())
-            _LOGGER.info("  Decrypted data bytes: %s", [hex(b) for b in decrypted_data])
+            if _LOGGER.isEnabledFor(logging.INFO):
+                _LOGGER.info("🔍 DECRYPTED DATA ANALYSIS:")
+                _LOGGER.info("  Decrypted data length: %d", len(decrypted_data))
+                _LOGGER.info("  Decrypted data hex: %s", decrypted_data.hex())
             
             return {
-                'src_id': struct.unpack('<I', decrypted_packet.src_id + b'\x00')[0],  # Convert 3 bytes to 32-bit int
-                'nwk_id': struct.unpack('<H', decrypted_packet.nwk_id)[0],  # Convert to integer
+                'src_id': UINT32_LE.unpack_from(decrypted_data, 0)[0] & 0xFFFFFF,  # 3-byte source ID
+                'nwk_id': UINT16_LE.unpack_from(decrypted_data, 3)[0],  # Convert to integer
                 'fw_version': decrypted_packet.fw_version,
                 'device_type': decrypted_packet.device_type,  # Keep as bytes
                 'payload': decrypted_packet.payload,  # Keep as bytes
@@ -152,101 +189,55 @@ class GemnsPacket:
                 'power_status': self.flags.self_external_power,
             }
         except Exception as e:
-            _LOGGER.error(f"Decryption failed: {e}")
+            # Reported once per problem by the coordinator, not per frame
+            _LOGGER.debug("Decryption failed: %s", e)
             return None
     
     def parse_sensor_data(self, decrypted_data: Dict[str, Any]) -> Dict[str, Any]:
         """Parse sensor-specific data based on sensor type."""
         # Parse device_type as little-endian 16-bit integer from bytes
         device_type_bytes = decrypted_data['device_type']  # Already bytes
-        device_type = struct.unpack('<H', device_type_bytes)[0]  # Little-endian unsigned short
+        device_type = UINT16_LE.unpack(device_type_bytes)[0]  # Little-endian unsigned short
         payload = decrypted_data['payload']  # Already bytes
         
-        _LOGGER.info("🔍 SENSOR DATA PARSING:")
-        _LOGGER.info("  Device type bytes: %s", device_type_bytes.hex())
-        _LOGGER.info("  Device type decimal: %d", device_type)
-        _LOGGER.info("  Payload: %s", payload.hex())
+        if _LOGGER.isEnabledFor(logging.INFO):
+            _LOGGER.info("🔍 SENSOR DATA PARSING:")
+            _LOGGER.info("  Device type decimal: %d", device_type)
+            _LOGGER.info("  Payload: %s", payload.hex())
+        
+        # Parse based on sensor type (matching device_type_t enum) with one table lookup
+        event_flag = SENSOR_EVENT_FLAGS.get(device_type)
+        if event_flag is None:
+            return {
+                'device_type': device_type,
+                'event_counter_lsb': decrypted_data['event_counter_lsb'],
+                'payload_length': decrypted_data['payload_length'],
+                'encrypt_status': decrypted_data['encrypt_status'],
+                'power_status': decrypted_data['power_status'],
+            }
+        
+        flag_key, flag_event = event_flag
+        if len(payload) >= 4:
+            # Event Counter (3 bytes) + Sensor Event Report (1 byte)
+            sensor_event = payload[3]
+            event_counter = UINT32_LE.unpack_from(payload, 0)[0] & 0xFFFFFF  # Low 3 bytes
+            event_flag_set = sensor_event == flag_event
+        else:
+            # No payload data - device is off/idle
+            sensor_event = event_counter = 0
+            event_flag_set = False
         
-        sensor_data = {
+        # Build the result in one literal now that every field is known
+        return {
             'device_type': device_type,
             'event_counter_lsb': decrypted_data['event_counter_lsb'],
             'payload_length': decrypted_data['payload_length'],
             'encrypt_status': decrypted_data['encrypt_status'],
             'power_status': decrypted_data['power_status'],
+            'event_counter': event_counter,
+            'sensor_event': sensor_event,
+            flag_key: event_flag_set,
         }
-        
-        # Parse based on sensor type (matching device_type_t enum)
-        if device_type == 4:  # DEVICE_TYPE_LEAK_SENSOR
-            if len(payload) >= 4:
-                # Event Counter (3 bytes) + Sensor Event Report (1 byte)
-                event_counter = struct.unpack('<I', payload[0:3] + b'\x00')[0]  # Pad to 4 bytes
-                sensor_event = payload[3]
-                
-                sensor_data.update({
-                    'event_counter': event_counter,
-                    'sensor_event': sensor_event,
-                    'leak_detected': sensor_event == 4,  # EVENT_TYPE_LEAK_DETECTED = 4
-                })
-            else:
-                # No payload data - device is off/no leak
-                sensor_data.update({
-                    'event_counter': 0,
-                    'sensor_event': 0,
-                    'leak_detected': False,  # No payload means no leak detected
-                })
-        
-        elif device_type == 2:  # DEVICE_TYPE_VIBRATION_MONITOR
-            if len(payload) >= 4:
-                event_counter = struct.unpack('<I', payload[0:3] + b'\x00')[0]
-                sensor_event = payload[3]
-                
-                sensor_data.update({
-                    'event_counter': event_counter,
-                    'sensor_event': sensor_event,
-                    'vibration_detected': sensor_event == 1,  # EVENT_TYPE_VIBRATION = 1
-                })
-            else:
-                sensor_data.update({
-                    'event_counter': 0,
-                    'sensor_event': 0,
-                    'vibration_detected': False,
-                })
-        
-        elif device_type == 3:  # DEVICE_TYPE_TWO_WAY_SWITCH
-            if len(payload) >= 4:
-                event_counter = struct.unpack('<I', payload[0:3] + b'\x00')[0]
-                sensor_event = payload[3]
-                
-                sensor_data.update({
-                    'event_counter': event_counter,
-                    'sensor_event': sensor_event,
-                    'switch_on': sensor_event == 3,  # EVENT_TYPE_BUTTON_ON = 3
-                })
-            else:
-                sensor_data.update({
-                    'event_counter': 0,
-                    'sensor_event': 0,
-                    'switch_on': False,
-                })
-        
-        elif device_type in [0, 1]:  # DEVICE_TYPE_LEGACY, DEVICE_TYPE_BUTTON
-            if len(payload) >= 4:
-                event_counter = struct.unpack('<I', payload[0:3] + b'\x00')[0]
-                sensor_event = payload[3]
-                
-                sensor_data.update({
-                    'event_counter': event_counter,
-                    'sensor_event': sensor_event,
-                    'button_pressed': sensor_event == 0,  # EVENT_TYPE_BUTTON_PRESS = 0
-                })
-            else:
-                sensor_data.update({
-                    'event_counter': 0,
-                    'sensor_event': 0,
-                    'button_pressed': False,
-                })
-        
-        return sensor_data
 
 def parse_gems_packet(manufacturer_data: bytes, decryption_key: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
     """Parse Gemns™ IoT packet from manufacturer data."""
@@ -258,7 +249,8 @@ def parse_gems_packet(manufacturer_data: bytes, decryption_key: Optional[bytes]
         
         # Validate CRC before processing
         if not packet.validate_crc():
-            _LOGGER.warning("CRC validation failed for Gemns™ IoT packet")
+            # Reported once per problem by the coordinator, not per frame
+            _LOGGER.debug("CRC validation failed for Gemns™ IoT packet")
             return None
         
         result = {
@@ -282,5 +274,6 @@ def parse_gems_packet(manufacturer_data: bytes, decryption_key: Optional[bytes]
         return result
         
     except Exception as e:
-        _LOGGER.error(f"Failed to parse Gemns™ IoT packet: {e}")
+        # Reported once per problem by the coordinator, not per frame
+        _LOGGER.debug("Failed to parse Gemns™ IoT packet: %s", e)
         return None
@@ -234,8 +234,6 @@ class GemnsSwitch(SwitchEntity):
         
     async def _turn_on_light(self, **kwargs: Any):
         """Turn on a light switch with color options."""
-        import json
-        
         # Prepare turn on message
         turn_on_message = {
             "command": "turn_on",